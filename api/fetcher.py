@@ -0,0 +1,128 @@
+"""
+Concurrent fetch stage.
+
+Every Kalshi series and every Odds API sport is requested at once, so a scan
+takes about as long as its slowest single request rather than the sum of all
+of them. Each sport is fetched and fails on its own, and the whole stage runs
+under one shared deadline - whatever hasn't arrived by then is skipped.
+
+stream_sports() hands each sport back as soon as both of its sides are in, so
+analysis of a fast sport doesn't wait on a slow one.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Optional, Tuple, Iterator
+
+from api.kalshi_api import KalshiClient
+from api.odds_api import OddsAPIClient
+from config.settings import (
+    KALSHI_SPORT_MAP,
+    KALSHI_MAX_CONCURRENCY,
+    ODDS_API_MAX_CONCURRENCY,
+    FETCH_DEADLINE
+)
+
+logger = logging.getLogger(__name__)
+
+
+def stream_sports(kalshi_client: KalshiClient, odds_client: Optional[OddsAPIClient],
+                  sports: List[str], deadline: float = FETCH_DEADLINE, verbose: bool = True,
+                  odds_filters: Optional[Dict] = None) -> Iterator[Tuple[str, List[Dict], List[Dict]]]:
+    """
+    Fetch Kalshi game winner markets and Vegas h2h odds for every sport concurrently.
+
+    Yields (sport, kalshi_markets, vegas_events) for each sport, keyed by Odds
+    API sport key, as soon as both of its fetches have finished. A side that
+    failed or missed the deadline comes back as an empty list; sports still
+    outstanding at the deadline are yielded last with whatever did arrive.
+    Without an odds_client (dry run) only Kalshi is fetched. odds_filters are
+    passed through to get_h2h_odds (commence-time window, bookmakers).
+    """
+    odds_filters = odds_filters or {}
+    kalshi_data = {sport: [] for sport in sports}
+    vegas_data = {sport: [] for sport in sports}
+    outstanding = {sport: 0 for sport in sports}
+
+    # Separate pools so each API keeps its own concurrency cap
+    kalshi_pool = ThreadPoolExecutor(max_workers=KALSHI_MAX_CONCURRENCY)
+    odds_pool = ThreadPoolExecutor(max_workers=ODDS_API_MAX_CONCURRENCY)
+    futures = {}
+    for sport in sports:
+        if sport in KALSHI_SPORT_MAP:
+            future = kalshi_pool.submit(kalshi_client.get_sport_game_winner_markets, KALSHI_SPORT_MAP[sport])
+            futures[future] = ('Kalshi', sport, kalshi_data)
+            outstanding[sport] += 1
+        if odds_client:
+            future = odds_pool.submit(odds_client.get_h2h_odds, sport, **odds_filters)
+            futures[future] = ('Vegas', sport, vegas_data)
+            outstanding[sport] += 1
+
+    # Nothing to wait for (e.g. no Kalshi series and no odds client)
+    yielded = set()
+    for sport in sports:
+        if not outstanding[sport]:
+            yielded.add(sport)
+            yield sport, kalshi_data[sport], vegas_data[sport]
+
+    def harvest(future) -> str:
+        source, sport, results = futures[future]
+        outstanding[sport] -= 1
+        try:
+            results[sport] = future.result()
+        except Exception as e:
+            logger.warning(f"Failed to fetch {source} {sport}: {e}")
+        else:
+            if verbose:
+                unit = 'markets' if source == 'Kalshi' else 'events'
+                print(f"  - {source} {sport}: {len(results[sport])} {unit}", flush=True)
+        return sport
+
+    # The deadline is fixed up front: time the caller spends on a yielded sport
+    # counts against it, but results that land meanwhile are still collected
+    end = time.monotonic() + deadline if deadline is not None else None
+    pending = set(futures)
+    try:
+        while pending:
+            timeout = max(0.0, end - time.monotonic()) if end is not None else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                sport = harvest(future)
+                if not outstanding[sport]:
+                    yielded.add(sport)
+                    yield sport, kalshi_data[sport], vegas_data[sport]
+
+        # Deadline passed: keep whatever finished, skip only what's still running
+        for future in [f for f in pending if f.done()]:
+            pending.discard(future)
+            harvest(future)
+        if pending:
+            late = sorted(f"{futures[future][0]} {futures[future][1]}" for future in pending)
+            logger.warning(f"Fetch deadline ({deadline}s) passed, skipping: {', '.join(late)}")
+        for sport in sports:
+            if sport not in yielded:
+                yield sport, kalshi_data[sport], vegas_data[sport]
+    finally:
+        # Don't hold the scan up on stragglers past the deadline
+        kalshi_pool.shutdown(wait=False, cancel_futures=True)
+        odds_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_all(kalshi_client: KalshiClient, odds_client: Optional[OddsAPIClient],
+              sports: List[str], deadline: float = FETCH_DEADLINE, verbose: bool = True,
+              odds_filters: Optional[Dict] = None) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+    """
+    Fetch everything, then return (kalshi_data, vegas_data) keyed by Odds API sport key.
+
+    A sport that failed or missed the deadline maps to an empty list.
+    """
+    kalshi_data, vegas_data = {}, {}
+    for sport, kalshi_markets, vegas_events in stream_sports(kalshi_client, odds_client, sports,
+                                                              deadline=deadline, verbose=verbose,
+                                                              odds_filters=odds_filters):
+        kalshi_data[sport] = kalshi_markets
+        vegas_data[sport] = vegas_events
+    return kalshi_data, vegas_data
@@ -1,16 +1,21 @@
 """Kalshi API client for fetching sports prediction markets."""
 
 import requests
-import time
 import logging
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Iterator
 
 from config.settings import (
     KALSHI_API_BASE_URL,
-    REQUEST_TIMEOUT,
-    MAX_RETRIES,
-    RETRY_BASE_DELAY
+    KALSHI_MAX_CONCURRENCY,
+    KALSHI_PAGE_LIMIT,
+    KALSHI_MAX_PAGES,
+    KALSHI_RATE_LIMIT,
+    KALSHI_RATE_BURST
 )
+from api.rate_limiter import get_host_limiter
+from api.request_layer import RequestLayer
+from api.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -20,102 +25,155 @@ class KalshiClient:
 
     BASE_URL = KALSHI_API_BASE_URL
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Kalshi client."""
+    def __init__(self, api_key: Optional[str] = None, response_cache: Optional[ResponseCache] = None):
+        """Initialize Kalshi client. With a response_cache, market listings (and their asks) are served from it."""
         self.api_key = api_key
+        self.response_cache = response_cache
         self.session = requests.Session()
+        # One pooled connection per concurrent series request
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(KALSHI_MAX_CONCURRENCY, 10))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers['Content-Type'] = 'application/json'
         if api_key:
             self.session.headers['Authorization'] = f'Bearer {api_key}'
+        self.limiter = get_host_limiter(self.BASE_URL, KALSHI_RATE_LIMIT, KALSHI_RATE_BURST,
+                                        KALSHI_MAX_CONCURRENCY)
+        self.http = RequestLayer(self.session, self.BASE_URL, self.limiter)
 
     def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
                  data: Optional[Dict] = None) -> Dict:
-        """Make HTTP request with retry logic."""
-        url = f"{self.BASE_URL}{endpoint}"
-
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=data,
-                    timeout=REQUEST_TIMEOUT
-                )
-                response.raise_for_status()
-                return response.json()
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    delay = RETRY_BASE_DELAY * (2 ** attempt)
-                    logger.warning(f"Rate limited, waiting {delay}s...")
-                    time.sleep(delay)
-                else:
-                    logger.error(f"HTTP error: {e}")
-                    raise
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {e}")
-                if attempt == MAX_RETRIES - 1:
-                    raise
-                time.sleep(RETRY_BASE_DELAY)
-
-        return {}
+        """Make HTTP request through the shared retrying, rate-limited request layer."""
+        return self.http.request(method, f"{self.BASE_URL}{endpoint}", params=params, json=data)
 
     def get_markets(self, status: str = 'open', limit: int = 1000,
                     cursor: Optional[str] = None,
-                    series_ticker: Optional[str] = None) -> Dict:
+                    series_ticker: Optional[str] = None,
+                    event_ticker: Optional[str] = None,
+                    use_cache: bool = True) -> Dict:
         """Fetch markets from Kalshi."""
         params = {'status': status, 'limit': limit}
         if cursor:
             params['cursor'] = cursor
         if series_ticker:
             params['series_ticker'] = series_ticker
-        return self._request('GET', '/markets', params=params)
-
-    def get_game_winner_markets(self, sports: List[str] = None,
-                                 verbose: bool = False) -> List[Dict]:
-        """Get game winner (moneyline) markets for specified sports."""
+        if event_ticker:
+            params['event_ticker'] = event_ticker
+        if self.response_cache is None or not use_cache:
+            return self._request('GET', '/markets', params=params)
+        return self.response_cache.get_or_fetch(ResponseCache.make_key('/markets', params),
+                                                lambda: self._request('GET', '/markets', params=params))
+
+    def iter_market_pages(self, status: str = 'open', limit: int = KALSHI_PAGE_LIMIT,
+                          series_ticker: Optional[str] = None,
+                          max_pages: int = KALSHI_MAX_PAGES) -> Iterator[List[Dict]]:
+        """
+        Yield every page of markets, following Kalshi's cursor.
+
+        While the caller works through page N, page N+1 is already being
+        fetched on a background thread. Only one page is ever fetched ahead,
+        so memory stays at two pages however long the listing is.
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self.get_markets, status=status, limit=limit,
+                                        series_ticker=series_ticker)
+            pages = 0
+            while pending is not None:
+                result = pending.result()
+                pages += 1
+                markets = result.get('markets', [])
+                cursor = result.get('cursor')
+
+                pending = None
+                if cursor and markets and pages < max_pages:
+                    pending = prefetcher.submit(self.get_markets, status=status, limit=limit,
+                                                cursor=cursor, series_ticker=series_ticker)
+                elif cursor and markets:
+                    logger.warning(f"Stopped paging {series_ticker or 'markets'} after {pages} pages")
+
+                yield markets
+
+    SERIES_MAP = {
+        'nfl': 'KXNFLGAME',
+        'nba': 'KXNBAGAME',
+        'mlb': 'KXMLBGAME',
+        'nhl': 'KXNHLGAME',
+        'ncaab': 'KXNCAAMBGAME',
+        'ncaaw': 'KXNCAAWBGAME',
+    }
+
+    def get_sport_game_winner_markets(self, sport: str) -> List[Dict]:
+        """
+        Fetch every page of one sport's game winner series.
+
+        Each market is tagged with its team code, game id and sport. Errors
+        propagate so callers can decide how to isolate them.
+        """
+        series = self.SERIES_MAP.get(sport.lower())
+        if not series:
+            return []
+        markets = []
+
+        for page in self.iter_market_pages(series_ticker=series):
+            for market in page:
+                self._tag_market(market, sport)
+            markets.extend(page)
+
+        return markets
+
+    @staticmethod
+    def _tag_market(market: Dict, sport: str):
+        """Tag a game winner market with its team code, game id and sport from the ticker."""
+        parts = market.get('ticker', '').split('-')
+        if len(parts) >= 3:
+            market['_team_code'] = parts[-1]
+            market['_game_id'] = parts[1]
+            market['_sport'] = sport.lower()
+
+    def get_game_markets(self, sport: str, event_ticker: str) -> List[Dict]:
+        """
+        Fetch one game's markets (e.g. KXNBAGAME-26JAN11ATLCHA), tagged like a series.
+
+        Used to watch live prices, so it always bypasses the response cache.
+        """
+        markets = self.get_markets(event_ticker=event_ticker, use_cache=False).get('markets', [])
+        for market in markets:
+            self._tag_market(market, sport)
+        return markets
+
+    def get_game_winner_markets(self, sports: List[str] = None, verbose: bool = False,
+                                max_workers: int = KALSHI_MAX_CONCURRENCY) -> List[Dict]:
+        """
+        Get game winner (moneyline) markets for specified sports.
+
+        Each sport is its own series request, so they're fetched concurrently
+        (at most max_workers in flight). A failing series is reported and
+        skipped without affecting the others.
+        """
         if sports is None:
             sports = ['nfl', 'nba']
 
-        series_map = {
-            'nfl': 'KXNFLGAME',
-            'nba': 'KXNBAGAME',
-            'mlb': 'KXMLBGAME',
-            'nhl': 'KXNHLGAME',
-            'ncaab': 'KXNCAAMBGAME',
-            'ncaaw': 'KXNCAAWBGAME',
-        }
-
-        all_markets = []
-
-        for sport in sports:
-            series = series_map.get(sport.lower())
-            if not series:
-                continue
-
-            if verbose:
-                print(f"  Fetching {sport.upper()} game winner markets...", flush=True)
-
-            try:
-                result = self.get_markets(series_ticker=series, limit=200)
-                markets = result.get('markets', [])
-
-                for market in markets:
-                    ticker = market.get('ticker', '')
-                    parts = ticker.split('-')
-                    if len(parts) >= 3:
-                        market['_team_code'] = parts[-1]
-                        market['_game_id'] = parts[1] if len(parts) > 1 else ''
-                        market['_sport'] = sport.lower()
-                    all_markets.append(market)
-
-                if verbose:
-                    print(f"    Found {len(markets)} markets", flush=True)
-
-            except Exception as e:
+        jobs = [sport for sport in sports if sport.lower() in self.SERIES_MAP]
+        if not jobs:
+            return []
+
+        if verbose:
+            print(f"  Fetching {', '.join(sport.upper() for sport in jobs)} game winner markets...", flush=True)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+            futures = {pool.submit(self.get_sport_game_winner_markets, sport): sport for sport in jobs}
+            for future in as_completed(futures):
+                sport = futures[future]
+                try:
+                    results[sport] = future.result()
+                except Exception as e:
+                    results[sport] = []
+                    if verbose:
+                        print(f"    Error fetching {sport}: {e}", flush=True)
+                    continue
                 if verbose:
-                    print(f"    Error fetching {sport}: {e}", flush=True)
+                    print(f"    {sport.upper()}: found {len(results[sport])} markets", flush=True)
 
-        return all_markets
+        # Keep the caller's sport order regardless of which request finished first
+        return [market for sport in jobs for market in results[sport]]
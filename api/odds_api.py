@@ -1,20 +1,38 @@
 """The Odds API client for fetching Vegas sportsbook odds."""
 
+import math
 import requests
-import time
+import threading
 import logging
+from datetime import datetime, timezone
 from typing import Optional, List, Dict
 
 from config.settings import (
     ODDS_API_BASE_URL,
-    REQUEST_TIMEOUT,
-    MAX_RETRIES,
-    RETRY_BASE_DELAY
+    ODDS_API_MAX_CONCURRENCY,
+    ODDS_API_RATE_LIMIT,
+    ODDS_API_RATE_BURST
 )
+from api.rate_limiter import get_host_limiter
+from api.request_layer import RequestLayer
 
 logger = logging.getLogger(__name__)
 
 
+def format_api_time(value: datetime) -> str:
+    """The Odds API wants UTC timestamps as YYYY-MM-DDTHH:MM:SSZ, without fractions."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def request_cost(regions: str = 'us', bookmakers: Optional[List[str]] = None, markets: int = 1) -> int:
+    """Credits one odds request costs: markets x regions, each 10 bookmakers counting as a region."""
+    if bookmakers:
+        return markets * math.ceil(len(bookmakers) / 10)
+    return markets * len([r for r in regions.split(',') if r])
+
+
 class OddsAPIClient:
     """Client for interacting with The Odds API."""
 
@@ -28,48 +46,115 @@ class OddsAPIClient:
         self.session = requests.Session()
         self.remaining_requests = None
         self.used_requests = None
+        self._window_remaining = None
+        self._window_used = None
+        self._quota_lock = threading.Lock()
+        self.limiter = get_host_limiter(self.BASE_URL, ODDS_API_RATE_LIMIT, ODDS_API_RATE_BURST,
+                                        ODDS_API_MAX_CONCURRENCY)
+        self.http = RequestLayer(self.session, self.BASE_URL, self.limiter,
+                                 on_response=lambda response: self._record_quota(response.headers))
+
+    def _record_quota(self, headers):
+        """
+        Track quota from response headers.
+
+        With sports fetched concurrently, responses can arrive out of order, so
+        within one window of requests keep the lowest remaining / highest used
+        count seen rather than the last. A new window (start_quota_window)
+        starts from the next reading, so a monthly reset shows up right away.
+        """
+        remaining = headers.get('x-requests-remaining')
+        used = headers.get('x-requests-used')
+        with self._quota_lock:
+            if remaining is not None and (self._window_remaining is None or
+                                          float(remaining) < float(self._window_remaining)):
+                self._window_remaining = self.remaining_requests = remaining
+            if used is not None and (self._window_used is None or
+                                     float(used) > float(self._window_used)):
+                self._window_used = self.used_requests = used
+
+    def start_quota_window(self):
+        """Begin a new batch of requests; the last reported quota stays until one answers."""
+        with self._quota_lock:
+            self._window_remaining = None
+            self._window_used = None
 
     def _request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make HTTP GET request with retry logic."""
-        url = f"{self.BASE_URL}{endpoint}"
+        """Make HTTP GET request through the shared retrying, rate-limited request layer."""
         params = params or {}
         params['apiKey'] = self.api_key
-
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.session.get(url=url, params=params, timeout=REQUEST_TIMEOUT)
-                self.remaining_requests = response.headers.get('x-requests-remaining')
-                self.used_requests = response.headers.get('x-requests-used')
-                response.raise_for_status()
-                return response.json()
-
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:
-                    delay = RETRY_BASE_DELAY * (2 ** attempt)
-                    logger.warning(f"Rate limited, waiting {delay}s...")
-                    time.sleep(delay)
-                elif e.response.status_code == 401:
-                    raise ValueError("Invalid API key")
-                else:
-                    logger.error(f"HTTP error: {e}")
-                    raise
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {e}")
-                if attempt == MAX_RETRIES - 1:
-                    raise
-                time.sleep(RETRY_BASE_DELAY)
-
-        return []
+        try:
+            return self.http.request('GET', f"{self.BASE_URL}{endpoint}", params=params)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                raise ValueError("Invalid API key")
+            raise
 
     def get_quota_info(self) -> Dict:
         """Get current API quota information."""
         return {'remaining': self.remaining_requests, 'used': self.used_requests}
 
-    def get_h2h_odds(self, sport: str, regions: str = 'us') -> List[Dict]:
-        """Get head-to-head (moneyline) odds for a sport."""
-        params = {'regions': regions, 'markets': 'h2h', 'oddsFormat': 'american'}
+    def get_h2h_odds(self, sport: str, regions: str = 'us',
+                     commence_time_from: Optional[datetime] = None,
+                     commence_time_to: Optional[datetime] = None,
+                     bookmakers: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Get head-to-head (moneyline) odds for a sport.
+
+        The commence-time window and bookmaker list are applied by the API, so
+        far-off games and unwanted books never come over the wire. Bookmakers
+        take precedence over regions.
+        """
+        params = {'markets': 'h2h', 'oddsFormat': 'american'}
+        if bookmakers:
+            params['bookmakers'] = ','.join(bookmakers)
+        else:
+            params['regions'] = regions
+        if commence_time_from:
+            params['commenceTimeFrom'] = format_api_time(commence_time_from)
+        if commence_time_to:
+            params['commenceTimeTo'] = format_api_time(commence_time_to)
         result = self._request(f'/sports/{sport}/odds', params=params)
         if self.remaining_requests:
             logger.info(f"API quota remaining: {self.remaining_requests}")
         return result
+
+    def get_event_h2h_odds(self, sport: str, event_id: str, regions: str = 'us',
+                           bookmakers: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Get head-to-head odds for a single event via the per-event endpoint.
+
+        Returns None once the event is gone (finished or removed).
+        """
+        params = {'markets': 'h2h', 'oddsFormat': 'american'}
+        if bookmakers:
+            params['bookmakers'] = ','.join(bookmakers)
+        else:
+            params['regions'] = regions
+        try:
+            return self._request(f'/sports/{sport}/events/{event_id}/odds', params=params)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def refresh_events(self, sport: str, event_ids: List[str], regions: str = 'us',
+                       bookmakers: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Re-fetch odds for just these events of one sport.
+
+        A single event goes through the per-event endpoint. Several are
+        batched into one eventIds-filtered sport request instead, which
+        costs the same single credit rather than one credit per event.
+        """
+        if not event_ids:
+            return []
+        if len(event_ids) == 1:
+            event = self.get_event_h2h_odds(sport, event_ids[0], regions=regions, bookmakers=bookmakers)
+            return [event] if event else []
+        params = {'markets': 'h2h', 'oddsFormat': 'american', 'eventIds': ','.join(event_ids)}
+        if bookmakers:
+            params['bookmakers'] = ','.join(bookmakers)
+        else:
+            params['regions'] = regions
+        return self._request(f'/sports/{sport}/odds', params=params)
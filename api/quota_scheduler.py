@@ -0,0 +1,209 @@
+"""
+Quota-aware polling schedule for The Odds API.
+
+Every odds request costs credits, and a fixed refresh interval spends them as
+fast on a sport with nothing on until next week as on one with games tipping
+off in an hour. The scheduler turns the remaining quota into a per-hour budget
+for the rest of the quota period and splits it between sports by how soon
+their games start:
+
+- each upcoming game within the horizon adds 1 / (1 + hours_away / decay) to
+  its sport's weight, and games in progress count fully
+- sports with weight get polls in proportion to it, capped at the target
+  refresh rate scaled by weight (a sport only needs the full rate once about a
+  game's worth of weight is imminent); whatever a capped sport can't use goes
+  to the rest, and what nobody needs stays unspent
+- idle sports are polled only every max_interval, to pick up new schedules
+
+Each pass returns a PollPlan recording the budget and every sport's decision,
+so the credit burn rate can be audited.
+"""
+
+import calendar
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from models.poll_plan import PollDecision, PollPlan
+from config.settings import (
+    ODDS_POLL_INTERVAL,
+    ODDS_POLL_MAX_INTERVAL,
+    ODDS_POLL_HORIZON_HOURS,
+    ODDS_POLL_DECAY_HOURS,
+    ODDS_POLL_RESERVE,
+    IN_PLAY_HOURS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_commence_time(value: str) -> Optional[datetime]:
+    """Odds API commence_time ('2026-01-11T00:30:00Z') as an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+def quota_period_end(now: datetime) -> datetime:
+    """Odds API quotas reset at the start of each calendar month (UTC)."""
+    last_day = calendar.monthrange(now.year, now.month)[1]
+    return now.replace(day=last_day, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def allocate_rates(weights: Dict[str, float], budget: float,
+                   caps: Dict[str, float], min_rate: float) -> Dict[str, float]:
+    """
+    Split `budget` polls/hour across sports in proportion to weight.
+
+    Every sport gets at least min_rate and none more than its cap; the share a
+    capped sport can't use is handed on to the others (water-filling), and
+    whatever nobody can use is left unspent. If the budget can't even cover
+    min_rate everywhere, it's split by weight with a small floor so idle
+    sports still get the odd poll.
+    """
+    if not weights:
+        return {}
+    if budget <= min_rate * len(weights):
+        shares = {sport: weight + 0.1 for sport, weight in weights.items()}
+        total = sum(shares.values())
+        return {sport: max(budget, 0) * share / total for sport, share in shares.items()}
+
+    rates = {sport: min_rate for sport in weights}
+    spare = budget - min_rate * len(weights)
+    active = {sport for sport, weight in weights.items() if weight > 0 and caps[sport] > min_rate}
+    while active and spare > 1e-9:
+        total = sum(weights[sport] for sport in active)
+        capped = {sport for sport in active
+                  if spare * weights[sport] / total >= caps[sport] - rates[sport]}
+        if not capped:
+            for sport in active:
+                rates[sport] += spare * weights[sport] / total
+            break
+        for sport in capped:
+            spare -= caps[sport] - rates[sport]
+            rates[sport] = caps[sport]
+        active -= capped
+    return rates
+
+
+class QuotaScheduler:
+    """Decides how often to poll each sport given the remaining Odds API credits."""
+
+    def __init__(self, sports: List[str], target_interval: float = ODDS_POLL_INTERVAL,
+                 max_interval: float = ODDS_POLL_MAX_INTERVAL,
+                 horizon_hours: float = ODDS_POLL_HORIZON_HOURS,
+                 decay_hours: float = ODDS_POLL_DECAY_HOURS,
+                 reserve: float = ODDS_POLL_RESERVE, credits_per_poll: float = 1):
+        self.sports = list(sports)
+        self.target_interval = target_interval
+        self.max_interval = max(max_interval, target_interval)
+        self.horizon_hours = horizon_hours
+        self.decay_hours = decay_hours
+        self.reserve = reserve
+        self.credits_per_poll = credits_per_poll
+        self.kickoffs: Dict[str, List[datetime]] = {sport: [] for sport in self.sports}
+        self.last_polled: Dict[str, datetime] = {}
+        self.plan: Optional[PollPlan] = None
+
+    def observe(self, sport: str, events: List[Dict], now: Optional[datetime] = None):
+        """
+        Record a poll of `sport` and the commence times it returned.
+
+        An empty result keeps the kickoffs already known - a failed fetch also
+        comes back empty, and shouldn't demote the sport to idle. Stale
+        kickoffs drop out of the weighting on their own once they've passed.
+        """
+        self.last_polled[sport] = now or datetime.now(timezone.utc)
+        kickoffs = sorted(filter(None, (parse_commence_time(e.get('commence_time', '')) for e in events)))
+        if kickoffs:
+            self.kickoffs[sport] = kickoffs
+
+    def _weigh(self, sport: str, now: datetime) -> tuple:
+        """(weight, games in horizon, games in play, hours to next kickoff)."""
+        weight, upcoming, in_play, next_hours = 0.0, 0, 0, None
+        for kickoff in self.kickoffs.get(sport, []):
+            hours = (kickoff - now).total_seconds() / 3600
+            if -IN_PLAY_HOURS <= hours <= 0:
+                in_play += 1
+                weight += 1
+            elif 0 < hours <= self.horizon_hours:
+                upcoming += 1
+                weight += 1 / (1 + hours / self.decay_hours)
+            if hours > 0 and next_hours is None:
+                next_hours = hours
+        return weight, upcoming, in_play, next_hours
+
+    def make_plan(self, remaining_credits: Optional[float],
+                  now: Optional[datetime] = None) -> PollPlan:
+        """Work out every sport's poll interval from the credits left."""
+        now = now or datetime.now(timezone.utc)
+        period_end = quota_period_end(now)
+        hours_left = max((period_end - now).total_seconds() / 3600, 1 / 60)
+        max_rate = 3600 / self.target_interval
+        min_rate = 3600 / self.max_interval
+
+        weighed = {sport: self._weigh(sport, now) for sport in self.sports}
+        if remaining_credits is None:
+            # No quota reading yet: poll everything at the target rate once to learn it
+            budget = None
+            rates = {sport: max_rate for sport in self.sports}
+        else:
+            budget = remaining_credits * (1 - self.reserve) / hours_left / self.credits_per_poll
+            # A sport needs the full target rate only once a game is on or about to be
+            caps = {sport: max(min_rate, max_rate * min(1.0, w[0])) for sport, w in weighed.items()}
+            rates = allocate_rates({sport: w[0] for sport, w in weighed.items()},
+                                   budget, caps, min_rate)
+
+        plan = PollPlan(created_at=now, remaining_credits=remaining_credits,
+                        period_end=period_end,
+                        budget_per_hour=budget * self.credits_per_poll if budget is not None else None)
+        for sport in self.sports:
+            weight, upcoming, in_play, next_hours = weighed[sport]
+            rate = rates[sport]
+            interval = 3600 / rate if rate > 0 else float('inf')
+            last = self.last_polled.get(sport)
+            if last is None:
+                next_poll_at = now
+            else:
+                # However little budget is left, everything is due again once the quota resets
+                next_poll_at = min(last + timedelta(seconds=min(interval, 366 * 86400)), period_end)
+
+            if budget is None:
+                reason = 'no quota reading yet'
+            elif weight == 0:
+                reason = 'idle: no games in horizon'
+            elif rate < min_rate - 1e-9:
+                reason = 'budget exhausted'
+            elif rate >= max_rate - 1e-9:
+                reason = 'at target refresh interval'
+            elif rate >= caps[sport] - 1e-9:
+                reason = 'games not imminent'
+            else:
+                reason = 'budget-limited'
+            plan.decisions.append(PollDecision(
+                sport=sport, weight=weight, games_in_horizon=upcoming, in_play=in_play,
+                hours_to_next_game=next_hours, polls_per_hour=rate,
+                credits_per_poll=self.credits_per_poll, interval_seconds=interval,
+                next_poll_at=next_poll_at, reason=reason))
+
+        self.plan = plan
+        logger.info(f"Poll plan: {plan.projected_per_hour:.2f} credits/hour projected"
+                    + (f" against a budget of {plan.budget_per_hour:.2f}" if budget is not None else ""))
+        return plan
+
+    def due(self, now: Optional[datetime] = None) -> List[str]:
+        """Sports whose next poll time has come under the current plan."""
+        now = now or datetime.now(timezone.utc)
+        if self.plan is None:
+            return list(self.sports)
+        return [d.sport for d in self.plan.decisions if d.next_poll_at <= now]
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        """How long to sleep before any sport is due (never past the quota reset)."""
+        now = now or datetime.now(timezone.utc)
+        if self.plan is None or not self.plan.decisions:
+            return 0.0
+        return max(0.0, min((d.next_poll_at - now).total_seconds() for d in self.plan.decisions))
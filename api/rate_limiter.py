@@ -0,0 +1,138 @@
+"""
+Client-side rate limiting shared by the API clients.
+
+Both APIs cap the request rate, and only reacting after a 429 means every
+parallel worker trips the limit before anyone slows down. A HostLimiter paces
+requests to one host with a token bucket and caps how many are in flight with
+an AIMD window - grow by about one slot per window of successes, halve on a
+429 - the way TCP congestion control probes for capacity.
+
+Limiters are per host and shared process-wide, so every client talking to the
+same API draws from the same budget.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    wait = self._resume_at - now
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds`, then restart from an empty bucket."""
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._resume_at:
+                self._resume_at = resume_at
+                self._tokens = 0
+                self._updated = resume_at
+
+
+class AIMDLimiter:
+    """
+    Concurrency cap that adapts to the server.
+
+    Each success adds 1/limit (about +1 per full window), each throttle halves
+    the limit. Only one throttle per window counts: requests that were already
+    in flight when the limit was cut report the same overload, so they carry
+    the window they started in and are ignored once it has moved on.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.limit = float(self.max_limit)
+        self.window = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> int:
+        """Wait for a free slot; returns the window the request starts in."""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+            return self.window
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            if self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self._cond.notify_all()
+
+    def on_throttle(self, window: int):
+        with self._cond:
+            if window == self.window:
+                self.limit = max(self.min_limit, self.limit / 2)
+                self.window += 1
+
+
+class HostLimiter:
+    """Token bucket + AIMD concurrency for one API host."""
+
+    def __init__(self, rate: float, burst: float, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AIMDLimiter(max_concurrency)
+
+    @contextmanager
+    def slot(self) -> Iterator[int]:
+        """Hold a concurrency slot and a rate token for one request; yields its window."""
+        window = self.concurrency.acquire()
+        try:
+            self.bucket.acquire()
+            yield window
+        finally:
+            self.concurrency.release()
+
+    def on_success(self):
+        self.concurrency.on_success()
+
+    def on_throttle(self, window: int, delay: float):
+        """A 429: halve the window and stop every caller for `delay` seconds."""
+        self.concurrency.on_throttle(window)
+        self.bucket.pause(delay)
+
+
+_LIMITERS: Dict[str, HostLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_host_limiter(url: str, rate: float, burst: float, max_concurrency: int) -> HostLimiter:
+    """The shared limiter for url's host, created with these settings on first use."""
+    host = urlparse(url).netloc
+    with _LIMITERS_LOCK:
+        if host not in _LIMITERS:
+            _LIMITERS[host] = HostLimiter(rate, burst, max_concurrency)
+        return _LIMITERS[host]
@@ -0,0 +1,231 @@
+"""
+Resilient request layer shared by the API clients.
+
+Every request goes through RequestLayer.request(), which:
+- paces itself with the host's rate limiter
+- retries 429s, 5xx responses and connection errors with full-jitter
+  exponential backoff, honoring Retry-After when the server sends one
+- trips a per-host circuit breaker after repeated failures, so a daemon scan
+  fails fast instead of hammering a struggling host
+- serves the last good response for a request while its host is down, as
+  long as it's recent (LAST_GOOD_MAX_AGE); only the most recently used
+  LAST_GOOD_MAX_ENTRIES responses per host are kept
+
+Other 4xx responses are raised straight away - retrying won't fix them.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from api.rate_limiter import HostLimiter
+from config.settings import (
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    LAST_GOOD_MAX_ENTRIES,
+    LAST_GOOD_MAX_AGE
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the host's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures.
+
+    While open every request fails fast. After `reset_timeout` seconds one
+    trial request is let through (half-open): success closes the circuit,
+    failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = 'closed'
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+            if self.state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = 'closed'
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_host_breaker(url: str) -> CircuitBreaker:
+    """The shared circuit breaker for url's host."""
+    host = urlparse(url).netloc
+    with _BREAKERS_LOCK:
+        if host not in _BREAKERS:
+            _BREAKERS[host] = CircuitBreaker()
+        return _BREAKERS[host]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)] so retrying clients spread out."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestLayer:
+    """Rate-limited, retrying, circuit-broken requests to one API host."""
+
+    def __init__(self, session: requests.Session, base_url: str, limiter: HostLimiter,
+                 on_response: Optional[Callable[[requests.Response], None]] = None):
+        self.session = session
+        self.host = urlparse(base_url).netloc
+        self.limiter = limiter
+        self.breaker = get_host_breaker(base_url)
+        self.on_response = on_response
+        self._last_good: OrderedDict = OrderedDict()  # key -> (stored at, data), oldest use first
+        self._last_good_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(method: str, url: str, params: Optional[Dict]) -> tuple:
+        params = params or {}
+        # Keep credentials out of the key
+        return method, url, tuple(sorted((k, str(v)) for k, v in params.items() if k != 'apiKey'))
+
+    def _remember(self, key: tuple, data: Any):
+        """Keep a good GET response, evicting the least recently used past the limit."""
+        with self._last_good_lock:
+            self._last_good[key] = (time.monotonic(), data)
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > LAST_GOOD_MAX_ENTRIES:
+                self._last_good.popitem(last=False)
+
+    def _fallback(self, key: tuple, error: Exception) -> Any:
+        """Serve the last good response for this request if it's recent enough, or re-raise."""
+        with self._last_good_lock:
+            cached = self._last_good.get(key)
+            if cached is not None:
+                age = time.monotonic() - cached[0]
+                if age > LAST_GOOD_MAX_AGE:
+                    del self._last_good[key]
+                    cached = None
+                else:
+                    self._last_good.move_to_end(key)
+        if cached is None:
+            raise error
+        logger.warning(f"{self.host} unavailable ({error}), serving last good response "
+                       f"from {age:.0f}s ago - prices may be stale")
+        return cached[1]
+
+    def request(self, method: str, url: str, params: Optional[Dict] = None,
+                json: Optional[Dict] = None) -> Any:
+        """Send a request and return the decoded JSON body."""
+        key = self._cache_key(method, url, params)
+        if not self.breaker.allow():
+            return self._fallback(key, CircuitOpenError(f"circuit open for {self.host}"))
+
+        error = None
+        for attempt in range(MAX_RETRIES):
+            delay = backoff_delay(attempt)
+            try:
+                with self.limiter.slot() as window:
+                    response = self.session.request(method=method, url=url, params=params,
+                                                    json=json, timeout=REQUEST_TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                # Connection resets, timeouts and the like
+                logger.warning(f"Request to {self.host} failed: {e}")
+                self.breaker.record_failure()
+                error = e
+            else:
+                if self.on_response:
+                    self.on_response(response)
+                status = response.status_code
+                if status < 500:
+                    # The host is up, even if it didn't like this request
+                    self.breaker.record_success()
+
+                if status < 400:
+                    self.limiter.on_success()
+                    data = response.json()
+                    if method.upper() == 'GET':
+                        self._remember(key, data)
+                    return data
+
+                error = requests.exceptions.HTTPError(f"{status} error for url: {response.url}",
+                                                      response=response)
+                if status != 429 and status < 500:
+                    raise error
+
+                if status >= 500:
+                    # Counts against the host whether or not we retry below
+                    logger.warning(f"{self.host} returned {status}")
+                    self.breaker.record_failure()
+
+                retry_after = retry_after_seconds(response)
+                if retry_after is not None:
+                    if retry_after > RETRY_MAX_DELAY:
+                        logger.warning(f"{self.host} asked to wait {retry_after:.0f}s, not retrying")
+                        break
+                    delay = retry_after
+                if status == 429:
+                    logger.warning(f"Rate limited by {self.host}, backing off {delay:.2f}s...")
+                    # Pauses every request to this host, not just this one
+                    self.limiter.on_throttle(window, delay)
+                    delay = 0
+
+            if attempt == MAX_RETRIES - 1 or not self.breaker.allow():
+                break
+            time.sleep(delay)
+
+        logger.error(f"Giving up on {url}: {error}")
+        return self._fallback(key, error)
@@ -0,0 +1,143 @@
+"""
+TTL response cache with stale-while-revalidate.
+
+Kalshi's series listings don't change much between back-to-back scans, so
+re-downloading them every run is mostly wasted time. Responses are kept in
+memory and on disk, keyed by endpoint + params:
+
+- younger than `ttl`: served as-is
+- older, but within `stale_ttl` after that: served immediately while a
+  background refresh replaces the entry for the next caller
+- older than that, or missing: fetched synchronously
+
+Disk entries let a fresh process pick up where the last scan left off.
+Entries too old to be served are pruned from memory and disk as the cache
+is used, so a long-running process doesn't accumulate one file per cursor.
+
+Kalshi listings carry the asks, so anything served from here is priced as of
+when it was fetched; callers that need live prices must bypass the cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.settings import RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTL, RESPONSE_CACHE_STALE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Endpoint+params -> JSON response cache, in-process and on disk."""
+
+    def __init__(self, directory: Optional[str] = RESPONSE_CACHE_DIR,
+                 ttl: float = RESPONSE_CACHE_TTL, stale_ttl: float = RESPONSE_CACHE_STALE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+        self._pruned_at = 0.0
+        self.prune()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        return json.dumps([endpoint, params or {}], sort_keys=True, default=str)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json')
+
+    def _load(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or not self.directory:
+            return entry
+        try:
+            with open(self._path(key)) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get('key') != key:
+            return None
+        entry = (stored['fetched_at'], stored['data'])
+        with self._lock:
+            self._entries.setdefault(key, entry)
+        return entry
+
+    def prune(self):
+        """Drop entries past ttl + stale_ttl - they'd be refetched anyway - in memory and on disk."""
+        now = time.time()
+        cutoff = now - self.ttl - self.stale_ttl
+        with self._lock:
+            self._pruned_at = now
+            for key in [k for k, (fetched_at, _) in self._entries.items() if fetched_at < cutoff]:
+                del self._entries[key]
+        if not self.directory:
+            return
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(('.json', '.tmp')):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass  # Already gone, or being replaced by another writer
+
+    def put(self, key: str, data: Any):
+        fetched_at = time.time()
+        if fetched_at - self._pruned_at > self.ttl + self.stale_ttl:
+            self.prune()
+        with self._lock:
+            self._entries[key] = (fetched_at, data)
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'key': key, 'fetched_at': fetched_at, 'data': data}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write response cache entry: {e}")
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]):
+        try:
+            self.put(key, fetch())
+        except Exception as e:
+            logger.warning(f"Background refresh failed, keeping stale entry: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return a cached response for key, refreshing or fetching it as its age requires."""
+        entry = self._load(key)
+        if entry is not None:
+            fetched_at, data = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return data
+            if age < self.ttl + self.stale_ttl:
+                with self._lock:
+                    start = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start:
+                    self._refresher.submit(self._refresh, key, fetch)
+                return data
+
+        data = fetch()
+        self.put(key, data)
+        return data
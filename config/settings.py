@@ -23,6 +23,7 @@ KALSHI_API_BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
 # Analysis Parameters
 MIN_NET_EDGE = 0.02
 MIN_BOOKMAKERS = 3
+AMERICAN_ODDS_TABLE_LIMIT = 10000  # implied-probability table covers -limit..+limit
 
 # Target Sports
 TARGET_SPORTS = [
@@ -36,12 +37,63 @@ SPORT_DISPLAY_NAMES = {
     'icehockey_nhl': 'NHL', 'baseball_mlb': 'MLB',
 }
 
+# Odds API sport key -> Kalshi sport (as tagged on markets by KalshiClient)
+KALSHI_SPORT_MAP = {
+    'americanfootball_nfl': 'nfl', 'basketball_nba': 'nba', 'icehockey_nhl': 'nhl',
+    'baseball_mlb': 'mlb', 'basketball_ncaab': 'ncaab', 'basketball_wncaab': 'ncaaw',
+}
+
+# Event Matching
+MATCH_MAX_WORKERS = 4
+MATCH_DATE_WINDOW_DAYS = 1  # Kalshi tickers carry a local date, not a timestamp
+MATCH_FUZZY_WORKERS = -1  # rapidfuzz cdist threads (-1 = all cores)
+MATCH_CACHE_PATH = './.cache/match_cache.json'
+MATCH_CACHE_UNDATED_MAX_AGE_DAYS = 7  # cached pairings with no game date are dropped after this
+MATCH_ASSIGNMENT = 'greedy'  # 'greedy' or 'optimal' (one-to-one)
+CHANGE_DETECTOR_MAX_AGE = 24 * 3600  # seconds an event unseen by --poll scans is remembered
+
 # Kalshi Fee Parameters
 KALSHI_TAKER_FEE_MULTIPLIER = 0.07
 KALSHI_MAKER_FEE_MULTIPLIER = 0.0175
+KALSHI_FEE_TABLE_MAX_CONTRACTS = 1000  # fee table covers 1-99c x up to this many contracts
+
+# Position Sizing
+SIZING_BUDGET = 100.0  # dollars per opportunity the sizer may spend
+SIZING_SUGGESTIONS = 3  # lowest-fee-drag contract counts shown per opportunity
 
 # Output/Request Settings
 EXPORT_PATH = './output/'
 REQUEST_TIMEOUT = 30
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 30  # backoff cap; a longer Retry-After gives up instead of waiting
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive 5xx / connection failures before a host's circuit opens
+CIRCUIT_RESET_TIMEOUT = 30  # seconds before an open circuit lets a trial request through
+LAST_GOOD_MAX_ENTRIES = 64  # responses per host kept to serve while the host is down
+LAST_GOOD_MAX_AGE = 300  # seconds; older last-good responses are not served
+KALSHI_MAX_CONCURRENCY = 4  # concurrent series requests (Kalshi's basic tier allows 20 reads/sec)
+KALSHI_PAGE_LIMIT = 1000  # markets per page (Kalshi's maximum)
+KALSHI_MAX_PAGES = 50  # safety stop when following cursors
+RESPONSE_CACHE_DIR = './.cache/responses'
+RESPONSE_CACHE_TTL = 30  # seconds a cached Kalshi listing is served as fresh
+RESPONSE_CACHE_STALE_TTL = 120  # further seconds it is served stale while refreshing in the background
+ODDS_API_MAX_CONCURRENCY = 6  # concurrent sport requests to The Odds API
+KALSHI_RATE_LIMIT = 10  # requests/sec, under Kalshi's basic-tier read limit
+KALSHI_RATE_BURST = 10
+ODDS_API_RATE_LIMIT = 5  # requests/sec
+ODDS_API_RATE_BURST = 5
+FETCH_DEADLINE = 60  # seconds for the whole Kalshi + Vegas fetch stage
+ODDS_HOURS_AHEAD = None  # only fetch games starting within this many hours (None = all upcoming)
+ODDS_BOOKMAKERS = []  # Odds API bookmaker keys to fetch instead of every US book, e.g. ['draftkings', 'fanduel']
+
+# Odds API Polling (--poll)
+ODDS_POLL_INTERVAL = 300  # target refresh interval: the fastest any sport is polled (seconds)
+ODDS_POLL_MAX_INTERVAL = 6 * 3600  # idle sports are still polled this often
+ODDS_POLL_HORIZON_HOURS = 48  # games further out don't count towards a sport's weight
+ODDS_POLL_DECAY_HOURS = 6  # a game this many hours away counts half as much as one starting now
+ODDS_POLL_RESERVE = 0.1  # fraction of remaining credits kept back
+IN_PLAY_HOURS = 3.5  # a game is treated as in progress this long after commence_time
+
+# Hot-event watch (--watch)
+WATCH_INTERVAL = 30  # seconds between refreshes of watched games
+WATCH_HOURS_AHEAD = 3  # games showing an edge that start within this many hours are watched
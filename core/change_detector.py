@@ -0,0 +1,104 @@
+"""
+Change detection between scans.
+
+When polling, most events haven't moved since the last scan: every book
+reports the same last_update and the Kalshi asks are unchanged. Rebuilding
+consensus and edges for them gives the same answer again. The ChangeDetector
+remembers, per Vegas event, what its inputs looked like and what came out:
+
+- Vegas inputs: each bookmaker's h2h last_update (or its prices if a book
+  doesn't report one) plus the team names
+- Kalshi inputs: the matched tickers and their yes_ask
+
+If neither changed, the previous opportunities are reused. If only Kalshi
+moved, the cached consensus is reused and just the edges are recomputed.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from config.settings import CHANGE_DETECTOR_MAX_AGE
+
+
+def vegas_fingerprint(event: Dict) -> tuple:
+    """What the consensus for this event depends on."""
+    books = []
+    for book in event.get('bookmakers', []):
+        for market in book.get('markets', []):
+            if market.get('key') != 'h2h':
+                continue
+            stamp = market.get('last_update') or book.get('last_update')
+            if stamp is None:
+                stamp = tuple((o.get('name'), o.get('price')) for o in market.get('outcomes', []))
+            books.append((book.get('key'), stamp))
+    return event.get('home_team'), event.get('away_team'), tuple(sorted(books, key=str))
+
+
+def kalshi_fingerprint(home_market: Optional[Dict], away_market: Optional[Dict]) -> tuple:
+    """What the edges depend on besides consensus: which markets, at what ask."""
+    return tuple((m.get('ticker'), m.get('yes_ask')) if m else None for m in (home_market, away_market))
+
+
+class ChangeDetector:
+    """Per-event memo of scan inputs and the opportunities they produced."""
+
+    def __init__(self, max_age: float = CHANGE_DETECTOR_MAX_AGE):
+        self.max_age = max_age
+        self._entries: Dict[str, Dict] = {}
+        self.reused = 0
+        self.recomputed = 0
+
+    def evaluate(self, matches: List[Dict],
+                 consensus: Callable[[List[Dict]], List[Optional[Dict]]],
+                 edges: Callable[[Dict, Dict], List]) -> List:
+        """
+        Opportunities for every match, recomputing only what changed.
+
+        consensus(vegas_events) builds the Vegas consensus for a list of events
+        in one call - only the events whose odds moved are passed to it;
+        edges(match, consensus) turns one match's consensus into opportunities.
+        """
+        keys = []
+        stale = []  # indexes of matches whose Vegas inputs changed
+        for i, match in enumerate(matches):
+            event = match['vegas_event']
+            entry = self._entries.get(event.get('id')) if event.get('id') else None
+            vegas_key = vegas_fingerprint(event)
+            keys.append(vegas_key)
+            if entry is None or entry['vegas'] != vegas_key:
+                stale.append(i)
+        fresh = dict(zip(stale, consensus([matches[i]['vegas_event'] for i in stale]) if stale else []))
+
+        opportunities = []
+        for i, match in enumerate(matches):
+            event_id = match['vegas_event'].get('id')
+            kalshi_key = kalshi_fingerprint(match.get('kalshi_home_market'), match.get('kalshi_away_market'))
+            if i in fresh:
+                probs = fresh[i]
+            else:
+                entry = self._entries[event_id]
+                entry['seen_at'] = time.monotonic()
+                if entry['kalshi'] == kalshi_key:
+                    self.reused += 1
+                    opportunities.extend(entry['opportunities'])
+                    continue
+                probs = entry['consensus']
+
+            self.recomputed += 1
+            found = edges(match, probs) if probs else []
+            opportunities.extend(found)
+            if event_id:
+                self._entries[event_id] = {
+                    'vegas': keys[i],
+                    'kalshi': kalshi_key,
+                    'consensus': probs,
+                    'opportunities': found,
+                    'seen_at': time.monotonic(),
+                }
+        return opportunities
+
+    def prune(self):
+        """Forget events not seen for max_age seconds (games that have finished)."""
+        cutoff = time.monotonic() - self.max_age
+        for event_id in [k for k, entry in self._entries.items() if entry['seen_at'] < cutoff]:
+            del self._entries[event_id]
@@ -0,0 +1,118 @@
+"""
+Batch Vegas consensus.
+
+Building consensus one event at a time means a Python loop per bookmaker and
+pure-Python statistics.median/stdev per event, which adds up across a full
+slate. Here every event x bookmaker x {home, away} price for a scan is packed
+into one NaN-padded array, de-vigged in a single vectorized step, and reduced
+along the bookmaker axis - median, sample stdev and book count for all
+events at once.
+
+The result for each event is the same dict ValueFinder has always produced
+(or None when there isn't enough data).
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.odds_converter import american_to_implied_probs
+
+
+def _pack(events: List[Dict], min_bookmakers: int, allowed: Optional[set]):
+    """Flatten usable h2h prices into (event index, home price, away price) columns."""
+    rows, home_prices, away_prices = [], [], []
+    for i, event in enumerate(events):
+        books = event.get('bookmakers', [])
+        if allowed:
+            books = [book for book in books if book.get('key') in allowed]
+        if len(books) < min_bookmakers:
+            continue  # Not enough data to trust
+        home_team = event.get('home_team', '')
+        away_team = event.get('away_team', '')
+        for book in books:
+            for market in book.get('markets', []):
+                if market['key'] != 'h2h':
+                    continue
+                home_price = away_price = None
+                for outcome in market['outcomes']:
+                    name = outcome['name']
+                    if name == home_team:
+                        home_price = outcome['price']
+                    if name == away_team:
+                        away_price = outcome['price']
+                if home_price is not None and away_price is not None:
+                    rows.append(i)
+                    home_prices.append(home_price)
+                    away_prices.append(away_price)
+    return (np.array(rows, dtype=np.intp), np.array(home_prices, dtype=float),
+            np.array(away_prices, dtype=float))
+
+
+def _median(grid: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-row median of the first counts[i] values (NaN padding sorts to the end)."""
+    ordered = np.sort(grid, axis=1)
+    rows = np.arange(len(grid))
+    lo = np.maximum(counts - 1, 0) // 2
+    hi = counts // 2
+    return (ordered[rows, lo] + ordered[rows, hi]) / 2
+
+
+def _stdev(grid: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-row sample standard deviation; 0 where there's a single value."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(grid, axis=1) / counts
+        squares = np.nansum((grid - mean[:, None]) ** 2, axis=1)
+        return np.where(counts > 1, np.sqrt(squares / (counts - 1)), 0.0)
+
+
+def batch_consensus(events: List[Dict], min_bookmakers: int,
+                    bookmakers: Optional[Iterable[str]] = None) -> List[Optional[Dict]]:
+    """
+    Consensus probabilities for every event, in input order.
+
+    Each entry is {'home_prob', 'away_prob', 'num_bookmakers', 'home_std',
+    'away_std'} - medians of the de-vigged probabilities across books and
+    their sample standard deviations - or None if the event has fewer than
+    min_bookmakers books (counting only `bookmakers` when given) or no usable
+    h2h line.
+    """
+    results: List[Optional[Dict]] = [None] * len(events)
+    rows, home_prices, away_prices = _pack(events, min_bookmakers, set(bookmakers) if bookmakers else None)
+    if not len(rows):
+        return results
+
+    # De-vig every book's line at once
+    home_impl = american_to_implied_probs(home_prices)
+    away_impl = american_to_implied_probs(away_prices)
+    total = home_impl + away_impl
+    if np.any(total <= 0):
+        raise ValueError("Sum of probabilities must be positive")
+    home_true = home_impl / total
+    away_true = away_impl / total
+
+    # Scatter into an events x books grid padded with NaN
+    counts = np.bincount(rows, minlength=len(events))
+    starts = np.cumsum(counts) - counts
+    slots = np.arange(len(rows)) - starts[rows]
+    width = int(counts.max())
+    home_grid = np.full((len(events), width), np.nan)
+    away_grid = np.full((len(events), width), np.nan)
+    home_grid[rows, slots] = home_true
+    away_grid[rows, slots] = away_true
+
+    home_median = _median(home_grid, counts)
+    away_median = _median(away_grid, counts)
+    home_std = _stdev(home_grid, counts)
+    away_std = _stdev(away_grid, counts)
+
+    for i in np.flatnonzero(counts).tolist():
+        n = int(counts[i])
+        results[i] = {
+            'home_prob': float(home_median[i]),
+            'away_prob': float(away_median[i]),
+            'num_bookmakers': n,
+            'home_std': float(home_std[i]) if n > 1 else 0,
+            'away_std': float(away_std[i]) if n > 1 else 0
+        }
+    return results
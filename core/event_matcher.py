@@ -1,26 +1,24 @@
 """Event matching between Vegas and Kalshi platforms."""
 
-from typing import List, Dict, Tuple
-from rapidfuzz import fuzz
-
-# City prefixes to remove for normalization
-CITY_PREFIXES = [
-    'los angeles', 'la', 'new york', 'ny', 'san francisco', 'sf',
-    'tampa bay', 'tb', 'golden state', 'gs', 'san antonio', 'sa',
-    'oklahoma city', 'okc', 'new orleans', 'no', 'green bay', 'gb',
-    'kansas city', 'kc', 'las vegas', 'lv', 'new england', 'ne',
-    'san diego', 'sd', 'san jose', 'sj', 'st louis', 'stl',
-    'salt lake', 'sl', 'twin cities', 'minnesota', 'mn',
-    'washington', 'dc', 'miami', 'denver', 'phoenix', 'seattle',
-    'boston', 'chicago', 'detroit', 'houston', 'dallas', 'atlanta',
-    'philadelphia', 'baltimore', 'cleveland', 'indianapolis',
-    'jacksonville', 'cincinnati', 'pittsburgh', 'carolina',
-    'arizona', 'tennessee', 'buffalo', 'milwaukee', 'orlando',
-    'memphis', 'portland', 'sacramento', 'utah', 'toronto',
-    'brooklyn', 'colorado', 'florida', 'anaheim', 'columbus',
-    'edmonton', 'calgary', 'vancouver', 'ottawa', 'montreal',
-    'winnipeg', 'nashville', 'new jersey',
-]
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Tuple, Optional, Set, TYPE_CHECKING
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from config.settings import (
+    KALSHI_SPORT_MAP, MATCH_MAX_WORKERS, MATCH_DATE_WINDOW_DAYS, MATCH_FUZZY_WORKERS,
+    MATCH_ASSIGNMENT
+)
+from core.title_scanner import AhoCorasick
+from core.team_normalizer import (
+    normalize_team_name, extract_college_school_name, normalize_school_name
+)
+
+if TYPE_CHECKING:
+    from core.match_cache import MatchCache
 
 # Team nickname to Kalshi abbreviation
 NICKNAME_TO_ABBREV = {
@@ -129,28 +127,6 @@ FULL_NAME_TO_ABBREV = {
     'washington nationals': 'wsh',
 }
 
-# College mascots to remove for normalization
-COLLEGE_MASCOTS = [
-    'wildcats', 'bulldogs', 'tigers', 'eagles', 'bears', 'lions', 'panthers',
-    'hawks', 'huskies', 'cardinals', 'knights', 'bearcats', 'buckeyes',
-    'wolverines', 'spartans', 'gophers', 'badgers', 'hawkeyes', 'cyclones',
-    'jayhawks', 'sooners', 'longhorns', 'aggies', 'razorbacks', 'rebels',
-    'volunteers', 'commodores', 'gamecocks', 'gators', 'seminoles', 'hurricanes',
-    'cavaliers', 'hokies', 'wolfpack', 'tar heels', 'blue devils', 'demon deacons',
-    'orange', 'yellow jackets', 'fighting irish', 'trojans', 'bruins', 'ducks',
-    'beavers', 'cougars', 'utes', 'buffaloes', 'sun devils', 'golden bears',
-    'cardinal', 'mountaineers', 'red raiders', 'horned frogs', 'mustangs',
-    'owls', 'bobcats', 'roadrunners', 'miners', 'lobos', 'aztecs',
-    'falcons', 'rams', 'broncos', 'cowboys', 'cornhuskers', 'bluejays',
-    'shockers', 'pirates', 'billikens', 'musketeers', 'hoyas',
-    'friars', 'red storm', 'peacocks', 'gaels', 'toreros', 'dons', 'waves',
-    'anteaters', 'matadors', 'titans', 'highlanders', 'hornets',
-    'braves', 'jaguars', 'golden lions', 'bison', 'midshipmen', 'black knights',
-    'scarlet knights', 'nittany lions', 'terrapins', 'hoosiers', 'boilermakers',
-    'fighting illini', 'golden flashes', 'redhawks', 'rockets', 'chippewas',
-    'bulls', 'zips', 'penguins', 'thundering herd', 'flames',
-]
-
 # College abbreviation mappings
 COLLEGE_ABBREV_MAP = {
     'usc': ['southern california', 'usc trojans', 'trojans'],
@@ -249,51 +225,66 @@ COLLEGE_ABBREV_MAP = {
 }
 
 
-def extract_college_school_name(vegas_name: str) -> str:
-    """Extract school name from Vegas college team name (removes mascot)."""
-    if not vegas_name:
-        return ''
-    name_lower = vegas_name.lower().strip()
-    for mascot in sorted(COLLEGE_MASCOTS, key=len, reverse=True):
-        if name_lower.endswith(' ' + mascot):
-            name_lower = name_lower[:-len(mascot)-1].strip()
-            break
-    name_lower = name_lower.replace('st.', 'st').replace('state', 'st')
-    name_lower = name_lower.replace("'s", 's').replace("'", '')
-    return name_lower.strip()
+def _build_college_alias_index() -> Tuple[Dict[str, str], Dict[str, List[Tuple[List[str], str]]]]:
+    """
+    Invert COLLEGE_ABBREV_MAP once at import.
+
+    Returns an exact alias -> abbrev dict, plus a first-token index of
+    (alias tokens, abbrev) pairs, longest alias first, for names that only
+    start with a known alias ("north carolina central"). Aliases are spelled
+    the way extract_college_school_name spells schools; when two schools share
+    an alias the one listed first keeps it.
+    """
+    exact = {}
+    by_first_token = {}
+    for abbrev, names in COLLEGE_ABBREV_MAP.items():
+        for name in names:
+            alias = normalize_school_name(name)
+            if alias in exact:
+                continue
+            exact[alias] = abbrev
+            tokens = alias.split()
+            by_first_token.setdefault(tokens[0], []).append((tokens, abbrev))
+    for entries in by_first_token.values():
+        entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+    return exact, by_first_token
+
+
+_COLLEGE_ALIAS_INDEX, _COLLEGE_PREFIX_INDEX = _build_college_alias_index()
+_COLLEGE_ALIASES_LOWER = {abbrev: [name.lower() for name in names]
+                          for abbrev, names in COLLEGE_ABBREV_MAP.items()}
 
 
+@lru_cache(maxsize=4096)
 def get_college_abbrev(team_name: str) -> str:
     """Get Kalshi abbreviation for a college team."""
     school = extract_college_school_name(team_name)
-    for abbrev, names in COLLEGE_ABBREV_MAP.items():
-        for name in names:
-            if school == name.lower() or school.startswith(name.lower()) or name.lower() in school:
-                return abbrev
+    if school in _COLLEGE_ALIAS_INDEX:
+        return _COLLEGE_ALIAS_INDEX[school]
     words = school.split()
+    for tokens, abbrev in _COLLEGE_PREFIX_INDEX.get(words[0] if words else '', []):
+        if words[:len(tokens)] == tokens:
+            return abbrev
     if len(words) == 1:
         return school[:3] if len(school) >= 3 else school
     return ''.join(w[0] for w in words if w)
 
 
-def match_college_teams(vegas_home: str, vegas_away: str, kalshi_title: str) -> Tuple[bool, float]:
-    """Match college teams between Vegas and Kalshi."""
-    home_school = extract_college_school_name(vegas_home)
-    away_school = extract_college_school_name(vegas_away)
-    title_lower = kalshi_title.lower().replace('st.', 'st').replace("'s", 's').replace("'", '')
+def college_title_text(kalshi_title: str) -> str:
+    """Lowercase a Kalshi title with the same St./apostrophe handling as school names."""
+    return kalshi_title.lower().replace('st.', 'st').replace("'s", 's').replace("'", '')
 
-    home_in_title = home_school in title_lower or any(
-        name.lower() in title_lower
-        for name in COLLEGE_ABBREV_MAP.get(get_college_abbrev(vegas_home), [])
-    )
-    away_in_title = away_school in title_lower or any(
-        name.lower() in title_lower
-        for name in COLLEGE_ABBREV_MAP.get(get_college_abbrev(vegas_away), [])
+
+def college_team_in_title(vegas_team: str, title_text: str) -> bool:
+    """Does a college-normalized title mention this team's school or any of its aliases?"""
+    return extract_college_school_name(vegas_team) in title_text or any(
+        name in title_text for name in _COLLEGE_ALIASES_LOWER.get(get_college_abbrev(vegas_team), [])
     )
 
-    home_score = fuzz.partial_ratio(home_school, title_lower)
-    away_score = fuzz.partial_ratio(away_school, title_lower)
 
+def college_match_result(home_in_title: bool, away_in_title: bool,
+                         home_score: float, away_score: float) -> Tuple[bool, float]:
+    """Decide a college match from the substring checks and fuzzy scores."""
     if home_in_title and away_in_title:
         return True, 100.0
     elif home_score >= 80 and away_score >= 80:
@@ -303,6 +294,18 @@ def match_college_teams(vegas_home: str, vegas_away: str, kalshi_title: str) ->
     return False, 0.0
 
 
+def match_college_teams(vegas_home: str, vegas_away: str, kalshi_title: str) -> Tuple[bool, float]:
+    """Match college teams between Vegas and Kalshi."""
+    title_lower = college_title_text(kalshi_title)
+    home_in_title = college_team_in_title(vegas_home, title_lower)
+    away_in_title = college_team_in_title(vegas_away, title_lower)
+
+    home_score = fuzz.partial_ratio(extract_college_school_name(vegas_home), title_lower)
+    away_score = fuzz.partial_ratio(extract_college_school_name(vegas_away), title_lower)
+
+    return college_match_result(home_in_title, away_in_title, home_score, away_score)
+
+
 def get_team_abbrev(team_name: str) -> str:
     """Get Kalshi abbreviation for a pro team name."""
     team_lower = team_name.lower().strip()
@@ -314,16 +317,86 @@ def get_team_abbrev(team_name: str) -> str:
     return ''
 
 
-def normalize_team_name(name: str) -> str:
-    """Normalize team name by removing city prefixes."""
-    if not name:
-        return ''
-    normalized = name.strip().lower()
-    for prefix in sorted(CITY_PREFIXES, key=len, reverse=True):
-        if normalized.startswith(prefix + ' '):
-            normalized = normalized[len(prefix):].strip()
-            break
-    return ' '.join(normalized.split())
+def _build_title_scanner() -> AhoCorasick:
+    """
+    Compile every team string we might look for in a Kalshi title.
+
+    That is the full names, nicknames and college aliases, the normalized
+    forms and last words the matcher derives from them, and every
+    abbreviation.
+    """
+    patterns = set()
+    for name, abbrev in list(FULL_NAME_TO_ABBREV.items()) + list(NICKNAME_TO_ABBREV.items()):
+        normalized = normalize_team_name(name)
+        patterns.update((name, normalized, normalized.split()[-1] if normalized else '', abbrev))
+    for abbrev, names in _COLLEGE_ALIASES_LOWER.items():
+        patterns.add(abbrev)
+        for name in names:
+            patterns.update((name, normalize_school_name(name)))
+    return AhoCorasick(patterns)
+
+
+_TITLE_SCANNER = _build_title_scanner()
+_COLLEGE_ALIAS_SETS = {abbrev: frozenset(names) for abbrev, names in _COLLEGE_ALIASES_LOWER.items()}
+
+
+def _title_mentions(game_data: Dict, spelling: str) -> Set[str]:
+    """Known team strings in one spelling of a game's title; each title is scanned at most once."""
+    found = game_data['mentions'].get(spelling)
+    if found is None:
+        found = game_data['mentions'][spelling] = _TITLE_SCANNER.find_all(game_data[spelling])
+    return found
+
+
+def _in_title(pattern: str, game_data: Dict, spelling: str) -> bool:
+    """Same answer as `pattern in game_data[spelling]`, from the title scan when the pattern is known."""
+    if pattern in _TITLE_SCANNER.patterns:
+        return pattern in _title_mentions(game_data, spelling)
+    return pattern in game_data[spelling]
+
+
+def _college_in_title(vegas_team: str, game_data: Dict) -> bool:
+    """college_team_in_title against a grouped game, as a set intersection over its title scan."""
+    if _in_title(extract_college_school_name(vegas_team), game_data, 'title_college'):
+        return True
+    aliases = _COLLEGE_ALIAS_SETS.get(get_college_abbrev(vegas_team))
+    return aliases is not None and not aliases.isdisjoint(_title_mentions(game_data, 'title_college'))
+
+
+_KALSHI_DATE_RE = re.compile(r'^(\d{2})(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)(\d{2})')
+_MONTHS = {m: i for i, m in enumerate(
+    ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'], 1)}
+_US_EASTERN = timezone(timedelta(hours=-5))
+
+
+def parse_kalshi_game_date(game_id: str) -> Optional[date]:
+    """Parse the game date from a Kalshi game id (26JAN11MILDEN -> 2026-01-11)."""
+    found = _KALSHI_DATE_RE.match(game_id.upper()) if game_id else None
+    if not found:
+        return None
+    year, month, day = found.groups()
+    try:
+        return date(2000 + int(year), _MONTHS[month], int(day))
+    except ValueError:
+        return None
+
+
+def parse_commence_date(commence_time: str) -> Optional[date]:
+    """
+    Parse an Odds API commence_time (UTC) into the US date Kalshi would use.
+
+    Shifting to Eastern Standard Time puts a 7pm ET tip-off back on the day
+    it is played instead of the next UTC day.
+    """
+    if not commence_time:
+        return None
+    try:
+        start = datetime.fromisoformat(commence_time.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if start.tzinfo is not None:
+        start = start.astimezone(_US_EASTERN)
+    return start.date()
 
 
 def calculate_team_match_score(vegas_team: str, kalshi_text: str) -> int:
@@ -331,16 +404,183 @@ def calculate_team_match_score(vegas_team: str, kalshi_text: str) -> int:
     return fuzz.partial_ratio(normalize_team_name(vegas_team), kalshi_text.lower())
 
 
+def _max_weight_assignment(weights: List[List[float]]) -> Dict[int, int]:
+    """
+    Hungarian algorithm on a dense rows x cols weight matrix (rows <= cols).
+
+    Returns row -> col for the assignment with the largest total weight.
+    Zero weight means "no edge"; callers drop those pairs.
+    """
+    n, m = len(weights), len(weights[0])
+    top = max(max(row) for row in weights)
+    inf = float('inf')
+    u, v = [0.0] * (n + 1), [0.0] * (m + 1)
+    owner, way = [0] * (m + 1), [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        min_slack = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = owner[j0], inf, 0
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                slack = (top - weights[i0 - 1][j - 1]) - u[i0] - v[j]
+                if slack < min_slack[j]:
+                    min_slack[j], way[j] = slack, j0
+                if min_slack[j] < delta:
+                    delta, j1 = min_slack[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    return {owner[j] - 1: j - 1 for j in range(1, m + 1) if owner[j]}
+
+
+def assign_one_to_one(options: Dict[int, List[Dict]]) -> Dict[int, Dict]:
+    """
+    Max-weight one-to-one pairing of Vegas events with Kalshi games.
+
+    options maps an event key to its candidate matches (each with 'game_id'
+    and 'score'). The candidate graph is very sparse - nearly every game is
+    wanted by a single event - so we split it into connected components and
+    only run the Hungarian algorithm on the few where events compete for the
+    same game. Uncontested events simply keep their best candidate.
+    """
+    events_by_game = {}
+    for event_key, event_options in options.items():
+        for option in event_options:
+            events_by_game.setdefault(option['game_id'], set()).add(event_key)
+
+    chosen = {}
+    seen = set()
+    for start in options:
+        if start in seen:
+            continue
+        # Collect the component: events linked through shared candidate games
+        component_events, component_games = [], []
+        stack = [start]
+        seen.add(start)
+        while stack:
+            event_key = stack.pop()
+            component_events.append(event_key)
+            for option in options[event_key]:
+                game_id = option['game_id']
+                if game_id in component_games:
+                    continue
+                component_games.append(game_id)
+                for other in events_by_game[game_id]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+
+        if len(component_events) == 1:
+            event_key = component_events[0]
+            chosen[event_key] = max(options[event_key], key=lambda o: o['score'])
+            continue
+
+        weights = [[0.0] * len(component_games) for _ in component_events]
+        by_pair = {}
+        for row, event_key in enumerate(component_events):
+            for option in options[event_key]:
+                col = component_games.index(option['game_id'])
+                if option['score'] > weights[row][col]:
+                    weights[row][col] = option['score']
+                    by_pair[(row, col)] = option
+
+        transpose = len(component_events) > len(component_games)
+        if transpose:
+            weights = [list(col) for col in zip(*weights)]
+        for a, b in _max_weight_assignment(weights).items():
+            row, col = (b, a) if transpose else (a, b)
+            if (row, col) in by_pair:
+                chosen[component_events[row]] = by_pair[(row, col)]
+
+    return chosen
+
+
+# Score given to pairings made straight from ticker team codes. Fuzzy
+# combined scores top out at 300 (pro) and 200 (college).
+INDEX_MATCH_SCORE = 400.0
+
+
+class _TitleScores:
+    """
+    Fuzzy scores of Vegas team strings against Kalshi titles, computed in bulk.
+
+    rapidfuzz's cdist scores the whole query x title matrix in C (across
+    worker threads) in one call per title spelling, rather than one
+    partial_ratio call per pair from Python. Only games that some pending
+    event will actually look at get a column.
+    """
+
+    def __init__(self, pending: List[Tuple[Dict, List[List[str]]]], kalshi_games: Dict[str, Dict],
+                 workers: int = MATCH_FUZZY_WORKERS):
+        self._rows = {}
+        self._columns = {}
+        self._matrix = {}
+        for is_college, title_key in ((True, 'title_college'), (False, 'title_lower')):
+            queries, columns = {}, {}
+            for teams, tiers in pending:
+                if teams['is_college'] != is_college:
+                    continue
+                for query in (teams['home_school'], teams['away_school']):
+                    queries.setdefault(query, len(queries))
+                for game_ids in tiers:
+                    for game_id in game_ids:
+                        columns.setdefault(game_id, len(columns))
+            if not queries or not columns:
+                continue
+            titles = [kalshi_games[game_id][title_key] for game_id in columns]
+            self._rows[is_college] = queries
+            self._columns[is_college] = columns
+            self._matrix[is_college] = process.cdist(
+                list(queries), titles, scorer=fuzz.partial_ratio, dtype=np.float64, workers=workers)
+
+    def score(self, teams: Dict, side: str, game_id: str) -> float:
+        """partial_ratio of one side's team string against a game's title."""
+        is_college = teams['is_college']
+        row = self._rows[is_college][teams[f'{side}_school']]
+        return float(self._matrix[is_college][row, self._columns[is_college][game_id]])
+
+
 class EventMatcher:
     """Matches events between Vegas and Kalshi platforms."""
 
-    def __init__(self, match_threshold: int = 80):
+    ASSIGNMENT_MODES = ('greedy', 'optimal')
+
+    def __init__(self, match_threshold: int = 80, partition_by_sport: bool = True,
+                 max_workers: int = MATCH_MAX_WORKERS, cache: Optional['MatchCache'] = None,
+                 assignment: str = MATCH_ASSIGNMENT):
+        """
+        assignment='greedy' lets each Vegas event take its own best game, as
+        before; 'optimal' pairs events and games one-to-one so that the total
+        match score is as high as possible.
+        """
+        if assignment not in self.ASSIGNMENT_MODES:
+            raise ValueError(f"assignment must be one of {self.ASSIGNMENT_MODES}, got {assignment!r}")
         self.match_threshold = match_threshold
-
-    def match_game_winner_markets(self, vegas_events: List[Dict],
-                                   kalshi_markets: List[Dict]) -> List[Dict]:
-        """Match Vegas events to Kalshi game winner markets."""
-        # Group Kalshi markets by game_id
+        self.partition_by_sport = partition_by_sport
+        self.max_workers = max_workers
+        self.cache = cache
+        self.assignment = assignment
+
+    @staticmethod
+    def _group_kalshi_games(kalshi_markets: List[Dict]) -> Dict[str, Dict]:
+        """Group Kalshi markets by game_id, keeping first-seen order."""
         kalshi_games = {}
         for market in kalshi_markets:
             game_id = market.get('_game_id', '')
@@ -350,89 +590,327 @@ class EventMatcher:
                 kalshi_games[game_id] = {
                     'markets': [],
                     'title': market.get('title', ''),
-                    'sport': market.get('_sport', '')
+                    'title_lower': market.get('title', '').lower(),
+                    'title_college': college_title_text(market.get('title', '')),
+                    'title_nospace': market.get('title', '').lower().replace(' ', ''),
+                    'mentions': {},
+                    'sport': market.get('_sport', ''),
+                    'date': parse_kalshi_game_date(game_id),
+                    'order': len(kalshi_games),
                 }
             kalshi_games[game_id]['markets'].append(market)
-
-        matches = []
-
-        for vegas_event in vegas_events:
-            vegas_home = vegas_event.get('home_team', '')
-            vegas_away = vegas_event.get('away_team', '')
-            sport_key = vegas_event.get('sport_key', '')
-            is_college = 'ncaa' in sport_key.lower()
-
-            if is_college:
-                home_abbrev = get_college_abbrev(vegas_home)
-                away_abbrev = get_college_abbrev(vegas_away)
-                home_school = extract_college_school_name(vegas_home)
-                away_school = extract_college_school_name(vegas_away)
-            else:
-                home_abbrev = get_team_abbrev(vegas_home)
-                away_abbrev = get_team_abbrev(vegas_away)
-                home_school = normalize_team_name(vegas_home)
-                away_school = normalize_team_name(vegas_away)
-
-            best_match = None
-            best_score = 0
-
-            for game_id, game_data in kalshi_games.items():
-                title = game_data['title']
-                markets = game_data['markets']
-                title_lower = title.lower()
-
-                if is_college:
-                    is_match, match_confidence = match_college_teams(vegas_home, vegas_away, title)
-                    if is_match:
-                        combined_score = match_confidence * 2
-                        if combined_score > best_score:
-                            home_market, away_market = None, None
-                            for m in markets:
-                                team_code = m.get('_team_code', '').lower()
-                                if team_code == home_abbrev:
-                                    home_market = m
-                                elif team_code == away_abbrev:
-                                    away_market = m
-                                elif fuzz.ratio(team_code, home_abbrev) >= 80 or home_school.startswith(team_code):
-                                    home_market = m
-                                elif fuzz.ratio(team_code, away_abbrev) >= 80 or away_school.startswith(team_code):
-                                    away_market = m
-                            if home_market or away_market:
-                                best_score = combined_score
-                                best_match = {'game_id': game_id, 'home_market': home_market,
-                                            'away_market': away_market, 'title': title}
-                else:
-                    home_in_title = (home_school in title_lower or
-                                    home_abbrev in title_lower.replace(' ', '') or
-                                    (home_school.split()[-1] if home_school else '') in title_lower)
-                    away_in_title = (away_school in title_lower or
-                                    away_abbrev in title_lower.replace(' ', '') or
-                                    (away_school.split()[-1] if away_school else '') in title_lower)
-
-                    home_score = calculate_team_match_score(vegas_home, title)
-                    away_score = calculate_team_match_score(vegas_away, title)
-
-                    if (home_in_title and away_in_title) or (home_score >= 60 and away_score >= 60):
-                        combined_score = home_score + away_score + (50 if home_in_title else 0) + (50 if away_in_title else 0)
-                        if combined_score > best_score:
-                            home_market, away_market = None, None
-                            for m in markets:
-                                team_code = m.get('_team_code', '').lower()
-                                if team_code == home_abbrev:
-                                    home_market = m
-                                elif team_code == away_abbrev:
-                                    away_market = m
-                            if home_market or away_market:
-                                best_score = combined_score
-                                best_match = {'game_id': game_id, 'home_market': home_market,
-                                            'away_market': away_market, 'title': title}
+        return kalshi_games
+
+    @staticmethod
+    def _build_team_index(kalshi_games: Dict[str, Dict]) -> Dict[str, List[str]]:
+        """
+        Index game ids by the team codes on their tickers.
+
+        Every Kalshi game winner market ends in the team's code
+        (KXNBAGAME-26JAN11MILDEN-DEN), so one pass over the markets tells us
+        which games each abbreviation plays in.
+        """
+        index = {}
+        for game_id, game_data in kalshi_games.items():
+            for market in game_data['markets']:
+                team_code = market.get('_team_code', '').lower()
+                if not team_code:
+                    continue
+                game_ids = index.setdefault(team_code, [])
+                if game_id not in game_ids:
+                    game_ids.append(game_id)
+        return index
+
+    @staticmethod
+    def _build_date_index(kalshi_games: Dict[str, Dict]) -> Dict[Optional[date], List[str]]:
+        """Bucket game ids by ticker date (None for tickers we couldn't parse)."""
+        buckets = {}
+        for game_id, game_data in kalshi_games.items():
+            buckets.setdefault(game_data['date'], []).append(game_id)
+        return buckets
+
+    @staticmethod
+    def _date_window(teams: Dict, date_index: Dict[Optional[date], List[str]]) -> Optional[Set[str]]:
+        """
+        Game ids close enough in time to be this event.
+
+        The event date is only an Eastern-time approximation of the local date
+        Kalshi puts on the ticker, so we allow +/- a day around it. Undated
+        games stay eligible, and an undated event gets no restriction at all.
+        """
+        event_date = teams['date']
+        if event_date is None:
+            return None
+        window = set(date_index.get(None, []))
+        for offset in range(-MATCH_DATE_WINDOW_DAYS, MATCH_DATE_WINDOW_DAYS + 1):
+            window.update(date_index.get(event_date + timedelta(days=offset), []))
+        return window
+
+    @staticmethod
+    def _date_distance(teams: Dict, game_data: Dict) -> int:
+        """Days between an event and a Kalshi game (0 when either is undated)."""
+        if teams['date'] is None or game_data['date'] is None:
+            return 0
+        return abs((game_data['date'] - teams['date']).days)
+
+    @staticmethod
+    def _event_teams(vegas_event: Dict) -> Dict:
+        """Work out the abbreviations and match strings for a Vegas event once."""
+        vegas_home = vegas_event.get('home_team', '')
+        vegas_away = vegas_event.get('away_team', '')
+        is_college = 'ncaa' in vegas_event.get('sport_key', '').lower()
+
+        if is_college:
+            home_abbrev = get_college_abbrev(vegas_home)
+            away_abbrev = get_college_abbrev(vegas_away)
+            home_school = extract_college_school_name(vegas_home)
+            away_school = extract_college_school_name(vegas_away)
+        else:
+            home_abbrev = get_team_abbrev(vegas_home)
+            away_abbrev = get_team_abbrev(vegas_away)
+            home_school = normalize_team_name(vegas_home)
+            away_school = normalize_team_name(vegas_away)
+
+        return {
+            'home': vegas_home, 'away': vegas_away, 'is_college': is_college,
+            'home_abbrev': home_abbrev, 'away_abbrev': away_abbrev,
+            'home_school': home_school, 'away_school': away_school,
+            'date': parse_commence_date(vegas_event.get('commence_time', '')),
+        }
+
+    @staticmethod
+    def _score_game(teams: Dict, game_data: Dict, home_score: float,
+                    away_score: float) -> Optional[Tuple[float, Optional[Dict], Optional[Dict]]]:
+        """Score one Kalshi game against a Vegas event's teams, given their fuzzy title scores."""
+        markets = game_data['markets']
+        home_abbrev, away_abbrev = teams['home_abbrev'], teams['away_abbrev']
+        home_school, away_school = teams['home_school'], teams['away_school']
+
+        if teams['is_college']:
+            is_match, match_confidence = college_match_result(
+                _college_in_title(teams['home'], game_data),
+                _college_in_title(teams['away'], game_data),
+                home_score, away_score)
+            if not is_match:
+                return None
+            combined_score = match_confidence * 2
+            home_market, away_market = None, None
+            for m in markets:
+                team_code = m.get('_team_code', '').lower()
+                if team_code == home_abbrev:
+                    home_market = m
+                elif team_code == away_abbrev:
+                    away_market = m
+                elif fuzz.ratio(team_code, home_abbrev) >= 80 or home_school.startswith(team_code):
+                    home_market = m
+                elif fuzz.ratio(team_code, away_abbrev) >= 80 or away_school.startswith(team_code):
+                    away_market = m
+        else:
+            home_in_title = (_in_title(home_school, game_data, 'title_lower') or
+                            _in_title(home_abbrev, game_data, 'title_nospace') or
+                            _in_title(home_school.split()[-1] if home_school else '', game_data, 'title_lower'))
+            away_in_title = (_in_title(away_school, game_data, 'title_lower') or
+                            _in_title(away_abbrev, game_data, 'title_nospace') or
+                            _in_title(away_school.split()[-1] if away_school else '', game_data, 'title_lower'))
+
+            if not ((home_in_title and away_in_title) or (home_score >= 60 and away_score >= 60)):
+                return None
+            combined_score = home_score + away_score + (50 if home_in_title else 0) + (50 if away_in_title else 0)
+            home_market, away_market = None, None
+            for m in markets:
+                team_code = m.get('_team_code', '').lower()
+                if team_code == home_abbrev:
+                    home_market = m
+                elif team_code == away_abbrev:
+                    away_market = m
+
+        if not (home_market or away_market):
+            return None
+        return combined_score, home_market, away_market
+
+    def _scored_games(self, teams: Dict, kalshi_games: Dict[str, Dict],
+                      game_ids: List[str], title_scores: '_TitleScores') -> List[Dict]:
+        """Every game in game_ids that matches the event, with its score, in game order."""
+        scored_games = []
+        for game_id in game_ids:
+            game_data = kalshi_games[game_id]
+            scored = self._score_game(teams, game_data,
+                                      title_scores.score(teams, 'home', game_id),
+                                      title_scores.score(teams, 'away', game_id))
+            if scored and scored[0] > 0:
+                score, home_market, away_market = scored
+                scored_games.append({'game_id': game_id, 'home_market': home_market, 'away_market': away_market,
+                                     'title': game_data['title'], 'score': score})
+        return scored_games
+
+    @staticmethod
+    def _best_option(options: List[Dict]) -> Optional[Dict]:
+        """Highest-scoring option; ties go to the game Kalshi listed first."""
+        best_match = None
+        for option in options:
+            if best_match is None or option['score'] > best_match['score']:
+                best_match = option
+        return best_match
+
+    def _resolve_from_index(self, teams: Dict, kalshi_games: Dict[str, Dict],
+                            team_index: Dict[str, List[str]],
+                            window: Optional[Set[str]] = None) -> Tuple[Optional[Dict], List[List[str]]]:
+        """
+        Resolve an event through the team-code index.
+
+        A single game carrying both teams' codes is taken as-is. Otherwise we
+        return the games left to fuzzy-score, as tiers tried in order: first
+        the handful of games carrying either code, then (college only) every
+        game. Pro markets are only ever paired by exact team code, so no game
+        outside the first tier could match; college codes are looser.
+        Everything is limited to the event's date window when one is given.
+        """
+        home_ids = team_index.get(teams['home_abbrev'], []) if teams['home_abbrev'] else []
+        away_ids = team_index.get(teams['away_abbrev'], []) if teams['away_abbrev'] else []
+        if window is not None:
+            home_ids = [g for g in home_ids if g in window]
+            away_ids = [g for g in away_ids if g in window]
+
+        both = [g for g in home_ids if g in away_ids]
+        if len(both) > 1 and teams['date'] is not None:
+            # Same two teams on back-to-back days: try the nearest date first
+            both.sort(key=lambda g: (self._date_distance(teams, kalshi_games[g]), kalshi_games[g]['order']))
+            if self._date_distance(teams, kalshi_games[both[0]]) < self._date_distance(teams, kalshi_games[both[1]]):
+                both = both[:1]
+        if len(both) == 1:
+            game_id = both[0]
+            game_data = kalshi_games[game_id]
+            home_market, away_market = None, None
+            for m in game_data['markets']:
+                team_code = m.get('_team_code', '').lower()
+                if team_code == teams['home_abbrev']:
+                    home_market = m
+                elif team_code == teams['away_abbrev']:
+                    away_market = m
+            return {'game_id': game_id, 'home_market': home_market, 'away_market': away_market,
+                    'title': game_data['title'], 'score': INDEX_MATCH_SCORE}, []
+
+        candidates = both or sorted(set(home_ids) | set(away_ids),
+                                    key=lambda g: kalshi_games[g]['order'])
+        tiers = [candidates] if candidates else []
+        if teams['is_college']:
+            tiers.append([g for g in kalshi_games if window is None or g in window])
+        return None, tiers
+
+    def _match_partition(self, vegas_events: List[Tuple[int, Dict]],
+                         kalshi_markets: List[Dict]) -> List[Tuple[int, Dict]]:
+        """Match one partition of (position, event) pairs against its markets."""
+        kalshi_games = self._group_kalshi_games(kalshi_markets)
+        team_index = self._build_team_index(kalshi_games)
+        date_index = self._build_date_index(kalshi_games)
+
+        # (position, event, candidate matches) for every event with any candidate
+        options = []
+        unresolved = []
+
+        for position, vegas_event in vegas_events:
+            teams = self._event_teams(vegas_event)
+            window = self._date_window(teams, date_index)
+            best_match, tiers = self._resolve_from_index(teams, kalshi_games, team_index, window)
 
             if best_match:
-                matches.append({
-                    'vegas_event': vegas_event,
-                    'kalshi_home_market': best_match['home_market'],
-                    'kalshi_away_market': best_match['away_market'],
-                    'game_id': best_match['game_id']
-                })
-
-        return matches
+                options.append((position, vegas_event, [best_match]))
+            elif tiers:
+                unresolved.append((position, vegas_event, teams, tiers))
+
+        # Whatever the index couldn't settle is fuzzy-scored from one batched matrix
+        title_scores = _TitleScores([(teams, tiers) for _, _, teams, tiers in unresolved], kalshi_games)
+        for position, vegas_event, teams, tiers in unresolved:
+            for game_ids in tiers:
+                scored_games = self._scored_games(teams, kalshi_games, game_ids, title_scores)
+                if scored_games:
+                    options.append((position, vegas_event, scored_games))
+                    break
+
+        if self.assignment == 'optimal':
+            chosen = assign_one_to_one({position: event_options for position, _, event_options in options})
+            matches = [(position, vegas_event, chosen[position])
+                       for position, vegas_event, _ in options if position in chosen]
+        else:
+            matches = [(position, vegas_event, self._best_option(event_options))
+                       for position, vegas_event, event_options in options]
+        matches.sort(key=lambda m: m[0])
+
+        return [(position, {
+            'vegas_event': vegas_event,
+            'kalshi_home_market': best_match['home_market'],
+            'kalshi_away_market': best_match['away_market'],
+            'game_id': best_match['game_id'],
+            'match_score': best_match['score']
+        }) for position, vegas_event, best_match in matches]
+
+    @staticmethod
+    def _partition_by_sport(vegas_events: List[Dict],
+                            kalshi_markets: List[Dict]) -> Dict[str, Tuple[List, List]]:
+        """
+        Split both sides by league.
+
+        Vegas events are keyed by their sport_key mapped to Kalshi's sport
+        code, Kalshi markets by the _sport tag the client puts on them. Leagues
+        share plenty of nicknames (Kings, Panthers, Jets, Cardinals), so
+        comparing across them only produces false candidates.
+        """
+        partitions = {}
+        for position, event in enumerate(vegas_events):
+            sport_key = event.get('sport_key', '')
+            sport = KALSHI_SPORT_MAP.get(sport_key, sport_key)
+            partitions.setdefault(sport, ([], []))[0].append((position, event))
+        for market in kalshi_markets:
+            sport = market.get('_sport', '')
+            if sport in partitions:
+                partitions[sport][1].append(market)
+        return partitions
+
+    def match_game_winner_markets(self, vegas_events: List[Dict],
+                                   kalshi_markets: List[Dict]) -> List[Dict]:
+        """
+        Match Vegas events to Kalshi game winner markets.
+
+        With a cache attached, events paired on an earlier scan are served
+        from it (as long as their tickers are still listed) and only the rest
+        go through matching - in 'optimal' mode, against the games no cached
+        pairing holds.
+        """
+        if self.cache is None:
+            return self._match_uncached(vegas_events, kalshi_markets)
+
+        cached, remaining = self.cache.lookup(vegas_events, kalshi_markets)
+        candidates = kalshi_markets
+        if self.assignment == 'optimal':
+            # One-to-one holds across the whole scan: games already held by a
+            # cached pairing aren't on offer to the new events
+            held = {(market.get('_sport'), market.get('_game_id'))
+                    for match in cached
+                    for market in (match.get('kalshi_home_market'), match.get('kalshi_away_market')) if market}
+            candidates = [market for market in kalshi_markets
+                          if (market.get('_sport'), market.get('_game_id')) not in held]
+        new_matches = self._match_uncached(remaining, candidates)
+        self.cache.store(new_matches)
+        self.cache.save()
+
+        order = {id(event): position for position, event in enumerate(vegas_events)}
+        return sorted(cached + new_matches, key=lambda m: order[id(m['vegas_event'])])
+
+    def _match_uncached(self, vegas_events: List[Dict],
+                        kalshi_markets: List[Dict]) -> List[Dict]:
+        """Run the matcher proper, partitioned by sport unless told otherwise."""
+        if not self.partition_by_sport:
+            matches = self._match_partition(list(enumerate(vegas_events)), kalshi_markets)
+            return [match for _, match in matches]
+
+        partitions = [p for p in self._partition_by_sport(vegas_events, kalshi_markets).values() if p[1]]
+        workers = min(self.max_workers, len(partitions))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda p: self._match_partition(*p), partitions))
+        else:
+            results = [self._match_partition(*p) for p in partitions]
+
+        # Hand matches back in Vegas event order, same as an unpartitioned run
+        matches = sorted((m for result in results for m in result), key=lambda m: m[0])
+        return [match for _, match in matches]
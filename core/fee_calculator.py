@@ -8,10 +8,101 @@ and drops toward the extremes. This makes sense - there's more "action"
 Formula: ceil(multiplier * contracts * price * (1 - price))
 - Taker fee: 7% multiplier (you're taking liquidity)
 - Maker fee: 1.75% multiplier (you're providing liquidity)
+
+Kalshi prices are whole cents, so fees are worked out in integer cents with
+the multiplier as an exact fraction. Doing it in floats puts results that
+land exactly on a cent (e.g. 10c x 100 contracts = 63c) a hair above it, and
+the ceil then charges a cent too much. Fees for 1-99c x up to
+KALSHI_FEE_TABLE_MAX_CONTRACTS contracts come from a lookup table built the
+first time it's needed; larger orders use the same integer formula directly.
 """
 
 import math
-from config.settings import KALSHI_TAKER_FEE_MULTIPLIER, KALSHI_MAKER_FEE_MULTIPLIER
+from fractions import Fraction
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config.settings import (
+    KALSHI_TAKER_FEE_MULTIPLIER,
+    KALSHI_MAKER_FEE_MULTIPLIER,
+    KALSHI_FEE_TABLE_MAX_CONTRACTS
+)
+
+_fee_tables: Dict[bool, np.ndarray] = {}
+
+
+def _multiplier(is_maker: bool) -> Fraction:
+    """The fee multiplier as an exact fraction (0.07 -> 7/100)."""
+    return Fraction(str(KALSHI_MAKER_FEE_MULTIPLIER if is_maker else KALSHI_TAKER_FEE_MULTIPLIER))
+
+
+def _exact_fee_cents(cents, num_contracts, is_maker: bool):
+    """
+    ceil(multiplier * contracts * price * (1 - price)) in cents, integers only.
+
+    With price = c / 100 that's ceil(multiplier * contracts * c * (100 - c) / 100).
+    Works on ints and on int64 arrays alike.
+    """
+    multiplier = _multiplier(is_maker)
+    numerator = multiplier.numerator * num_contracts * cents * (100 - cents)
+    return -(-numerator // (multiplier.denominator * 100))
+
+
+def fee_table(is_maker: bool = False) -> np.ndarray:
+    """
+    Fee in cents for every whole-cent price x contract count, built on first use.
+
+    table[c, n] is the fee for n contracts at c cents (row 0 and column 0 are
+    zero padding).
+    """
+    table = _fee_tables.get(is_maker)
+    if table is None:
+        cents = np.arange(100, dtype=np.int64)[:, None]
+        contracts = np.arange(KALSHI_FEE_TABLE_MAX_CONTRACTS + 1, dtype=np.int64)[None, :]
+        table = _exact_fee_cents(cents, contracts, is_maker)
+        table.setflags(write=False)
+        _fee_tables[is_maker] = table
+    return table
+
+
+def fee_cycle(cents: int, is_maker: bool = False) -> Tuple[int, int]:
+    """
+    (period, fee over one period) of the fee at a whole-cent price.
+
+    The fee is ceil(a * n / d) cents for coprime a and d, so it repeats every d
+    contracts - fee(n + d) = fee(n) + a - and only multiples of d land on an
+    exact cent (at most 10,000 contracts for taker, 40,000 for maker).
+    """
+    multiplier = _multiplier(is_maker)
+    numerator = multiplier.numerator * cents * (100 - cents)
+    denominator = multiplier.denominator * 100
+    divisor = math.gcd(numerator, denominator)
+    return denominator // divisor, numerator // divisor
+
+
+def fee_row(cents: int, max_contracts: int, is_maker: bool = False) -> np.ndarray:
+    """Fees in cents for 1..max_contracts contracts at one whole-cent price."""
+    if max_contracts <= KALSHI_FEE_TABLE_MAX_CONTRACTS:
+        return fee_table(is_maker)[cents, 1:max_contracts + 1]
+    return _exact_fee_cents(cents, np.arange(1, max_contracts + 1, dtype=np.int64), is_maker)
+
+
+def whole_cents(price: float) -> Optional[int]:
+    """Price in dollars as integer cents, or None if it isn't a whole number of cents."""
+    cents = round(price * 100)
+    return cents if abs(price * 100 - cents) < 1e-6 else None
+
+
+def fee_cents(cents: int, num_contracts: int, is_maker: bool = False) -> int:
+    """Exact Kalshi fee in cents for num_contracts at a whole-cent price."""
+    if not 1 <= cents <= 99:
+        raise ValueError(f"Price must be between 1 and 99 cents, got {cents}")
+    if num_contracts <= 0:
+        raise ValueError(f"Number of contracts must be positive, got {num_contracts}")
+    if num_contracts <= KALSHI_FEE_TABLE_MAX_CONTRACTS:
+        return int(fee_table(is_maker)[cents, num_contracts])
+    return _exact_fee_cents(cents, num_contracts, is_maker)
 
 
 def calculate_kalshi_fee(price: float, num_contracts: int, is_maker: bool = False) -> float:
@@ -26,6 +117,11 @@ def calculate_kalshi_fee(price: float, num_contracts: int, is_maker: bool = Fals
     if num_contracts <= 0:
         raise ValueError(f"Number of contracts must be positive, got {num_contracts}")
 
+    cents = whole_cents(price)
+    if cents is not None and float(num_contracts).is_integer():
+        return fee_cents(cents, int(num_contracts), is_maker) / 100
+
+    # Sub-cent price: no exact table entry, fall back to the float formula
     multiplier = KALSHI_MAKER_FEE_MULTIPLIER if is_maker else KALSHI_TAKER_FEE_MULTIPLIER
     raw_fee = multiplier * num_contracts * price * (1 - price)
 
@@ -33,7 +129,38 @@ def calculate_kalshi_fee(price: float, num_contracts: int, is_maker: bool = Fals
     return math.ceil(raw_fee * 100) / 100
 
 
+def calculate_kalshi_fees(prices, num_contracts, is_maker: bool = False) -> np.ndarray:
+    """
+    calculate_kalshi_fee over arrays: one fee per (price, contract count) pair.
+
+    Whole-cent prices are gathered from the fee table (or the integer formula
+    past its edge); anything else goes through the float formula, so each
+    entry matches the scalar version exactly.
+    """
+    prices, num_contracts = np.broadcast_arrays(np.asarray(prices, dtype=float),
+                                                np.asarray(num_contracts, dtype=float))
+    if np.any((prices <= 0) | (prices >= 1)):
+        raise ValueError("Prices must be between 0 and 1 exclusive")
+    if np.any(num_contracts <= 0):
+        raise ValueError("Number of contracts must be positive")
+
+    multiplier = KALSHI_MAKER_FEE_MULTIPLIER if is_maker else KALSHI_TAKER_FEE_MULTIPLIER
+    fees = np.ceil(multiplier * num_contracts * prices * (1 - prices) * 100)
+
+    cents = np.rint(prices * 100)
+    exact = (np.abs(prices * 100 - cents) < 1e-6) & (num_contracts == np.floor(num_contracts))
+    cents, contracts = cents.astype(np.int64), num_contracts.astype(np.int64)
+    in_table = exact & (contracts <= KALSHI_FEE_TABLE_MAX_CONTRACTS)
+    fees[in_table] = fee_table(is_maker)[cents[in_table], contracts[in_table]]
+    beyond = exact & ~in_table
+    fees[beyond] = _exact_fee_cents(cents[beyond], contracts[beyond], is_maker)
+    return fees / 100
+
+
 def calculate_effective_cost(price: float, num_contracts: int, is_maker: bool = False) -> float:
     """Total cost = price * contracts + fees. This is what actually leaves your account."""
+    cents = whole_cents(price)
+    if cents is not None and float(num_contracts).is_integer():
+        return (cents * int(num_contracts) + fee_cents(cents, int(num_contracts), is_maker)) / 100
     fee = calculate_kalshi_fee(price, num_contracts, is_maker)
     return (price * num_contracts) + fee
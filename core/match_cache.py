@@ -0,0 +1,146 @@
+"""
+Persistent Vegas -> Kalshi match cache.
+
+Once a Vegas event id has been paired with a Kalshi game, that pairing never
+changes. Keeping it on disk means repeat scans (polling, cron) only have to
+match games they haven't seen before.
+
+Entries are keyed by Vegas event id and hold the Kalshi game id, the home and
+away tickers, the match score and the day it was saved. An entry is dropped
+once its game date has passed (or, for tickers without a date, once it's
+MATCH_CACHE_UNDATED_MAX_AGE_DAYS old), or ignored if its tickers are no longer
+in the market listing.
+"""
+
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import List, Dict, Tuple, Optional
+
+from config.settings import MATCH_CACHE_PATH, MATCH_CACHE_UNDATED_MAX_AGE_DAYS
+from core.event_matcher import parse_kalshi_game_date
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCache:
+    """On-disk map of Vegas event id -> Kalshi game pairing."""
+
+    def __init__(self, path: str = MATCH_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Read the cache file, dropping anything whose game date has passed."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f).get('entries', {})
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable match cache {self.path}: {e}")
+            self.entries = {}
+        self.expire()
+
+    def save(self):
+        """
+        Write the cache back out if anything changed.
+
+        Called after every scan, so finished games are dropped here too - a
+        long --poll process would otherwise only expire entries on startup.
+        """
+        self.expire()
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'entries': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def expire(self, today: Optional[date] = None):
+        """
+        Forget games played before today.
+
+        Undated entries go once they're MATCH_CACHE_UNDATED_MAX_AGE_DAYS old
+        (ones from before saved_at was recorded start their clock now), and
+        entries with a date that doesn't parse are dropped rather than left to
+        break every save.
+        """
+        today = today or date.today()
+        undated_cutoff = today - timedelta(days=MATCH_CACHE_UNDATED_MAX_AGE_DAYS)
+        expired = []
+        for event_id, entry in self.entries.items():
+            try:
+                if entry.get('game_date'):
+                    if date.fromisoformat(entry['game_date']) < today:
+                        expired.append(event_id)
+                elif not entry.get('saved_at'):
+                    entry['saved_at'] = today.isoformat()
+                    self._dirty = True
+                elif date.fromisoformat(entry['saved_at']) < undated_cutoff:
+                    expired.append(event_id)
+            except (TypeError, ValueError, AttributeError):
+                logger.debug(f"Dropping match cache entry {event_id} with a bad date")
+                expired.append(event_id)
+        for event_id in expired:
+            del self.entries[event_id]
+        if expired:
+            self._dirty = True
+
+    def lookup(self, vegas_events: List[Dict],
+               kalshi_markets: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split events into cached matches and events still to be matched.
+
+        A cached pairing is only used if every ticker it names is in the
+        current market listing; the match is rebuilt from those live market
+        dicts so prices are current.
+        """
+        markets_by_ticker = {m.get('ticker'): m for m in kalshi_markets}
+        cached, remaining = [], []
+
+        for event in vegas_events:
+            entry = self.entries.get(event.get('id', ''))
+            if entry is None:
+                remaining.append(event)
+                continue
+            home_ticker, away_ticker = entry.get('home_ticker'), entry.get('away_ticker')
+            tickers = [t for t in (home_ticker, away_ticker) if t]
+            if not tickers or any(t not in markets_by_ticker for t in tickers):
+                remaining.append(event)
+                continue
+            cached.append({
+                'vegas_event': event,
+                'kalshi_home_market': markets_by_ticker.get(home_ticker),
+                'kalshi_away_market': markets_by_ticker.get(away_ticker),
+                'game_id': entry['game_id'],
+                'match_score': entry.get('match_score'),
+            })
+
+        return cached, remaining
+
+    def store(self, matches: List[Dict]):
+        """Remember new matches."""
+        for match in matches:
+            event_id = match['vegas_event'].get('id')
+            if not event_id:
+                continue
+            home_market = match.get('kalshi_home_market')
+            away_market = match.get('kalshi_away_market')
+            game_date = parse_kalshi_game_date(match['game_id'])
+            self.entries[event_id] = {
+                'game_id': match['game_id'],
+                'home_ticker': home_market.get('ticker') if home_market else None,
+                'away_ticker': away_market.get('ticker') if away_market else None,
+                'match_score': match.get('match_score'),
+                'game_date': game_date.isoformat() if game_date else None,
+                'saved_at': date.today().isoformat(),
+            }
+            self._dirty = True
@@ -8,9 +8,20 @@ sportsbooks make money.
 
 To find the "true" probability, we normalize back to 100%.
 This gives us a baseline to compare against Kalshi's prices.
+
+For whole slates, american_to_implied_probs() converts an array of prices at
+once. Bookmaker prices are integers in a narrow range, so it looks them up in
+a table of implied probabilities (built on first use) instead of doing the
+arithmetic per price; anything outside the table is computed directly.
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
+
+import numpy as np
+
+from config.settings import AMERICAN_ODDS_TABLE_LIMIT
+
+_implied_table: Optional[np.ndarray] = None
 
 
 def american_to_implied_prob(american_odds: int) -> float:
@@ -28,6 +39,42 @@ def american_to_implied_prob(american_odds: int) -> float:
     return abs(american_odds) / (abs(american_odds) + 100)
 
 
+def _implied_formula(prices: np.ndarray) -> np.ndarray:
+    """american_to_implied_prob element-wise, same arithmetic."""
+    magnitude = np.abs(prices)
+    with np.errstate(divide='ignore'):  # both branches are evaluated; -100 only hits the unused one
+        return np.where(prices > 0, 100 / (prices + 100), magnitude / (magnitude + 100))
+
+
+def implied_prob_table() -> np.ndarray:
+    """Implied probability for every integer price; table[odds + limit]."""
+    global _implied_table
+    if _implied_table is None:
+        odds = np.arange(-AMERICAN_ODDS_TABLE_LIMIT, AMERICAN_ODDS_TABLE_LIMIT + 1, dtype=float)
+        table = _implied_formula(odds)
+        table.setflags(write=False)
+        _implied_table = table
+    return _implied_table
+
+
+def american_to_implied_probs(prices) -> np.ndarray:
+    """
+    Convert an array of American odds to implied probabilities.
+
+    Integer prices within +/-AMERICAN_ODDS_TABLE_LIMIT are gathered from the
+    table; anything else (fractional or extreme odds) falls back to the
+    formula. Each entry equals american_to_implied_prob() of that price.
+    """
+    prices = np.asarray(prices, dtype=float)
+    in_table = (np.abs(prices) <= AMERICAN_ODDS_TABLE_LIMIT) & (prices == np.floor(prices))
+    if in_table.all():
+        return implied_prob_table()[prices.astype(np.intp) + AMERICAN_ODDS_TABLE_LIMIT]
+
+    probs = _implied_formula(prices)
+    probs[in_table] = implied_prob_table()[prices[in_table].astype(np.intp) + AMERICAN_ODDS_TABLE_LIMIT]
+    return probs
+
+
 def remove_vig(prob_a: float, prob_b: float) -> Tuple[float, float]:
     """
     Remove the vig by normalizing probabilities to 100%.
@@ -0,0 +1,86 @@
+"""
+Fee-aware position sizing.
+
+Kalshi rounds each order's fee up to the next cent, so the fee per contract
+jumps around with order size: at 10c, 1 contract pays a full cent of fee on
+0.63c owed, while 100 contracts pay exactly 63c. For a fixed price, EV per
+dollar depends only on the cost per contract, so the most efficient order
+sizes are the ones where that rounding wastes the least.
+
+The fee repeats on a fixed cycle (see fee_cycle), and only multiples of the
+cycle length pay no rounding waste at all. When the budget covers enough of
+them, those are the answer; otherwise the budget buys less than a few cycles
+and the sizer scans that short range from the fee table, ranking sizes by fee
+per contract (larger orders first among equals, since they earn more in
+total). Either way the work is bounded by the cycle length, not the budget.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from core.fee_calculator import fee_cents, fee_cycle, fee_row, whole_cents
+from models.position import PositionSize, SizingPlan
+from config.settings import SIZING_BUDGET, SIZING_SUGGESTIONS
+
+
+def size_position(price: float, vegas_prob: float, budget: float = SIZING_BUDGET,
+                  is_maker: bool = False, suggestions: int = SIZING_SUGGESTIONS) -> SizingPlan:
+    """
+    Order sizes for buying at `price` with `budget` dollars, given the Vegas probability.
+
+    The plan holds the single-contract minimum, the `suggestions` sizes with
+    the lowest fee drag (highest EV per dollar), and the largest size the
+    budget covers (highest total EV when the edge is positive).
+    """
+    cents = whole_cents(price)
+    if cents is None or not 1 <= cents <= 99:
+        raise ValueError(f"Price must be a whole number of cents between 1 and 99, got {price}")
+    plan = SizingPlan(price_cents=cents, vegas_prob=vegas_prob, budget=budget)
+
+    budget_cents = int(budget * 100 + 1e-6)
+    largest = _max_affordable(cents, budget_cents, is_maker)
+    if largest < 1:
+        return plan
+
+    def size(n: int, fee: int) -> PositionSize:
+        cost = cents * n + fee
+        return PositionSize(contracts=n, cost=cost / 100, fee=fee / 100,
+                            expected_value=vegas_prob * n - cost / 100)
+
+    period, _ = fee_cycle(cents, is_maker)
+    if largest // period >= suggestions:
+        # Multiples of the period are the only sizes with no rounding waste,
+        # and among equals the larger orders come first
+        counts = [(largest // period - i) * period for i in range(suggestions)]
+        plan.best = [size(n, fee_cents(cents, n, is_maker)) for n in counts]
+    else:
+        # Fewer than `suggestions` periods fit, so the scan stays short
+        fees = fee_row(cents, largest, is_maker)
+        counts = np.arange(1, largest + 1)
+        # Equal fractions divide to identical floats, so ties compare exactly
+        order = np.lexsort((-counts, fees / counts))
+        plan.best = [size(int(counts[i]), int(fees[i])) for i in order[:suggestions]]
+
+    plan.smallest = size(1, fee_cents(cents, 1, is_maker))
+    plan.largest = size(largest, fee_cents(cents, largest, is_maker))
+    return plan
+
+
+def _max_affordable(cents: int, budget_cents: int, is_maker: bool) -> int:
+    """Largest contract count whose cost fits the budget (cost only grows with the count)."""
+    lo, hi = 0, budget_cents // cents
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if cents * mid + fee_cents(cents, mid, is_maker) <= budget_cents:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def best_contracts(price: float, vegas_prob: float, budget: float = SIZING_BUDGET,
+                   is_maker: bool = False) -> Optional[int]:
+    """The single most fee-efficient order size, or None if the budget can't buy one contract."""
+    plan = size_position(price, vegas_prob, budget, is_maker, suggestions=1)
+    return plan.best[0].contracts if plan.best else None
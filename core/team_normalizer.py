@@ -0,0 +1,96 @@
+"""
+Team name normalization.
+
+Vegas gives us full names ("Los Angeles Lakers", "Duke Blue Devils") while
+Kalshi titles use cities, schools or nicknames. Stripping the city prefix or
+the college mascot gets both sides closer to the same string.
+
+The prefix and mascot tables are compiled into one regex each at import, and
+the results are memoized - the same few hundred team names come through
+every scan many times over.
+"""
+
+import re
+from functools import lru_cache
+
+# City prefixes to remove for normalization
+CITY_PREFIXES = [
+    'los angeles', 'la', 'new york', 'ny', 'san francisco', 'sf',
+    'tampa bay', 'tb', 'golden state', 'gs', 'san antonio', 'sa',
+    'oklahoma city', 'okc', 'new orleans', 'no', 'green bay', 'gb',
+    'kansas city', 'kc', 'las vegas', 'lv', 'new england', 'ne',
+    'san diego', 'sd', 'san jose', 'sj', 'st louis', 'stl',
+    'salt lake', 'sl', 'twin cities', 'minnesota', 'mn',
+    'washington', 'dc', 'miami', 'denver', 'phoenix', 'seattle',
+    'boston', 'chicago', 'detroit', 'houston', 'dallas', 'atlanta',
+    'philadelphia', 'baltimore', 'cleveland', 'indianapolis',
+    'jacksonville', 'cincinnati', 'pittsburgh', 'carolina',
+    'arizona', 'tennessee', 'buffalo', 'milwaukee', 'orlando',
+    'memphis', 'portland', 'sacramento', 'utah', 'toronto',
+    'brooklyn', 'colorado', 'florida', 'anaheim', 'columbus',
+    'edmonton', 'calgary', 'vancouver', 'ottawa', 'montreal',
+    'winnipeg', 'nashville', 'new jersey',
+]
+
+# College mascots to remove for normalization
+COLLEGE_MASCOTS = [
+    'wildcats', 'bulldogs', 'tigers', 'eagles', 'bears', 'lions', 'panthers',
+    'hawks', 'huskies', 'cardinals', 'knights', 'bearcats', 'buckeyes',
+    'wolverines', 'spartans', 'gophers', 'badgers', 'hawkeyes', 'cyclones',
+    'jayhawks', 'sooners', 'longhorns', 'aggies', 'razorbacks', 'rebels',
+    'volunteers', 'commodores', 'gamecocks', 'gators', 'seminoles', 'hurricanes',
+    'cavaliers', 'hokies', 'wolfpack', 'tar heels', 'blue devils', 'demon deacons',
+    'orange', 'yellow jackets', 'fighting irish', 'trojans', 'bruins', 'ducks',
+    'beavers', 'cougars', 'utes', 'buffaloes', 'sun devils', 'golden bears',
+    'cardinal', 'mountaineers', 'red raiders', 'horned frogs', 'mustangs',
+    'owls', 'bobcats', 'roadrunners', 'miners', 'lobos', 'aztecs',
+    'falcons', 'rams', 'broncos', 'cowboys', 'cornhuskers', 'bluejays',
+    'shockers', 'pirates', 'billikens', 'musketeers', 'hoyas',
+    'friars', 'red storm', 'peacocks', 'gaels', 'toreros', 'dons', 'waves',
+    'anteaters', 'matadors', 'titans', 'highlanders', 'hornets',
+    'braves', 'jaguars', 'golden lions', 'bison', 'midshipmen', 'black knights',
+    'scarlet knights', 'nittany lions', 'terrapins', 'hoosiers', 'boilermakers',
+    'fighting illini', 'golden flashes', 'redhawks', 'rockets', 'chippewas',
+    'bulls', 'zips', 'penguins', 'thundering herd', 'flames',
+]
+
+
+def _alternation(words) -> str:
+    """Longest-first alternation, so 'new york' wins over 'ny' and 'golden bears' over 'bears'."""
+    return '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_CITY_PREFIX_RE = re.compile(r'(?:%s) ' % _alternation(CITY_PREFIXES))
+_COLLEGE_MASCOT_RE = re.compile(r' (?:%s)\Z' % _alternation(COLLEGE_MASCOTS))
+
+
+@lru_cache(maxsize=4096)
+def normalize_team_name(name: str) -> str:
+    """Normalize team name by removing city prefixes."""
+    if not name:
+        return ''
+    normalized = name.strip().lower()
+    prefix = _CITY_PREFIX_RE.match(normalized)
+    if prefix:
+        normalized = normalized[prefix.end():]
+    return ' '.join(normalized.split())
+
+
+@lru_cache(maxsize=4096)
+def extract_college_school_name(vegas_name: str) -> str:
+    """Extract school name from Vegas college team name (removes mascot)."""
+    if not vegas_name:
+        return ''
+    name_lower = vegas_name.lower().strip()
+    mascot = _COLLEGE_MASCOT_RE.search(name_lower)
+    if mascot:
+        name_lower = name_lower[:mascot.start()].strip()
+    return normalize_school_name(name_lower)
+
+
+def normalize_school_name(school: str) -> str:
+    """Canonical spelling of a school name ("Saint Mary's" -> "saint marys", "Iowa State" -> "iowa st")."""
+    school = school.lower().strip()
+    school = school.replace('st.', 'st').replace('state', 'st')
+    school = school.replace("'s", 's').replace("'", '')
+    return school.strip()
@@ -0,0 +1,60 @@
+"""
+Multi-pattern substring search (Aho-Corasick).
+
+Checking "is this team in that title?" one pattern at a time costs
+patterns x titles substring scans. An Aho-Corasick automaton compiles every
+pattern into one trie with failure links, so a single left-to-right pass over
+a title reports every pattern it contains - linear in the title length no
+matter how many patterns there are.
+"""
+
+from collections import deque
+from typing import Iterable, Set
+
+
+class AhoCorasick:
+    """Automaton over a fixed set of patterns; find_all() returns those present in a text."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [frozenset()]
+        self.patterns = frozenset(p for p in patterns if p)
+
+        for pattern in self.patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(frozenset())
+                node = nxt
+            self._out[node] = self._out[node] | {pattern}
+
+        # Breadth-first so every node's failure target is finished before it
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Every pattern that occurs somewhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
@@ -9,14 +9,15 @@ But we have to account for Kalshi's fees too - a small edge gets eaten by fees.
 We only flag opportunities with meaningful edge after fees (default: 2%+).
 """
 
-import statistics
 import logging
 from typing import List, Dict, Optional
 
-from core.odds_converter import american_to_implied_prob, remove_vig
+from core.consensus import batch_consensus
 from core.event_matcher import EventMatcher
+from core.match_cache import MatchCache
+from core.change_detector import ChangeDetector
 from models.opportunity import ValueOpportunity, EdgeCalculation
-from config.settings import MIN_NET_EDGE, MIN_BOOKMAKERS
+from config.settings import MIN_NET_EDGE, MIN_BOOKMAKERS, MATCH_ASSIGNMENT
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,21 @@ logger = logging.getLogger(__name__)
 class ValueFinder:
     """Finds value betting opportunities by comparing Vegas odds to Kalshi prices."""
 
-    def __init__(self, min_edge: float = MIN_NET_EDGE, min_bookmakers: int = MIN_BOOKMAKERS):
+    def __init__(self, min_edge: float = MIN_NET_EDGE, min_bookmakers: int = MIN_BOOKMAKERS,
+                 match_cache: Optional[MatchCache] = None, match_assignment: str = MATCH_ASSIGNMENT,
+                 bookmakers: Optional[List[str]] = None,
+                 change_detector: Optional[ChangeDetector] = None):
         self.min_edge = min_edge
+        self.change_detector = change_detector
+        # Only these books count towards consensus; with a short list, requiring
+        # more books than it holds would reject every event
+        self.bookmakers = set(bookmakers) if bookmakers else None
+        if self.bookmakers and min_bookmakers > len(self.bookmakers):
+            logger.warning(f"Only {len(self.bookmakers)} bookmakers selected, "
+                           f"lowering min bookmakers from {min_bookmakers}")
+            min_bookmakers = len(self.bookmakers)
         self.min_bookmakers = min_bookmakers
-        self.matcher = EventMatcher()
+        self.matcher = EventMatcher(cache=match_cache, assignment=match_assignment)
 
     def _process_vegas_event(self, event: Dict) -> Optional[Dict]:
         """
@@ -36,37 +48,11 @@ class ValueFinder:
         We use the median (not mean) because it's more robust to outliers.
         One weird line from a sketchy book won't throw off our numbers.
         """
-        bookmakers = event.get('bookmakers', [])
-        if len(bookmakers) < self.min_bookmakers:
-            return None  # Not enough data to trust
-
-        home_probs, away_probs = [], []
-        home_team = event.get('home_team', '')
-        away_team = event.get('away_team', '')
-
-        for book in bookmakers:
-            for market in book.get('markets', []):
-                if market['key'] != 'h2h':
-                    continue
-                outcomes = {o['name']: o['price'] for o in market['outcomes']}
-                if home_team in outcomes and away_team in outcomes:
-                    # Convert American odds to probability, then remove the vig
-                    home_impl = american_to_implied_prob(outcomes[home_team])
-                    away_impl = american_to_implied_prob(outcomes[away_team])
-                    home_true, away_true = remove_vig(home_impl, away_impl)
-                    home_probs.append(home_true)
-                    away_probs.append(away_true)
-
-        if not home_probs:
-            return None
-
-        return {
-            'home_prob': statistics.median(home_probs),
-            'away_prob': statistics.median(away_probs),
-            'num_bookmakers': len(home_probs),
-            'home_std': statistics.stdev(home_probs) if len(home_probs) > 1 else 0,
-            'away_std': statistics.stdev(away_probs) if len(away_probs) > 1 else 0
-        }
+        return self._consensus([event])[0]
+
+    def _consensus(self, events: List[Dict]) -> List[Optional[Dict]]:
+        """Consensus for a whole slate in one vectorized pass (see core.consensus)."""
+        return batch_consensus(events, self.min_bookmakers, self.bookmakers)
 
     def _determine_confidence(self, num_bookmakers: int, prob_std: float) -> str:
         """
@@ -96,88 +82,88 @@ class ValueFinder:
         if verbose:
             print(f"  Matched {len(matches)} games between Vegas and Kalshi", flush=True)
 
-        for match in matches:
-            vegas_event = match['vegas_event']
-            home_market = match.get('kalshi_home_market')
-            away_market = match.get('kalshi_away_market')
-
-            vegas_probs = self._process_vegas_event(vegas_event)
-            if not vegas_probs:
-                continue
-
-            # Check home team for value
-            if home_market:
-                home_price = home_market.get('yes_ask', 0) / 100
-                if 0 < home_price < 1:
-                    home_calc = EdgeCalculation.calculate(
-                        kalshi_price=home_price,
-                        vegas_true_prob=vegas_probs['home_prob'],
-                        num_contracts=100,
-                        position='yes'
-                    )
-                    if home_calc.net_edge >= self.min_edge:
-                        prob_std = max(vegas_probs.get('home_std', 0), vegas_probs.get('away_std', 0))
-                        opp = ValueOpportunity(
-                            sport=vegas_event.get('sport_key', 'unknown'),
-                            vegas_event_id=vegas_event.get('id', ''),
-                            kalshi_ticker=home_market.get('ticker', ''),
-                            home_team=vegas_event.get('home_team', ''),
-                            away_team=vegas_event.get('away_team', ''),
-                            vegas_home_prob=vegas_probs['home_prob'],
-                            vegas_away_prob=vegas_probs['away_prob'],
-                            kalshi_home_price=home_price,
-                            kalshi_away_price=away_market.get('yes_ask', 0) / 100 if away_market else 0,
-                            recommended_position='yes',
-                            recommended_team='home',
-                            gross_edge=home_calc.gross_edge,
-                            net_edge=home_calc.net_edge,
-                            fee_impact=home_calc.fee_per_contract,
-                            expected_value_per_contract=home_calc.expected_value_per_contract,
-                            expected_value_100_contracts=home_calc.total_expected_value,
-                            num_bookmakers=vegas_probs['num_bookmakers'],
-                            confidence=self._determine_confidence(vegas_probs['num_bookmakers'], prob_std)
-                        )
-                        opportunities.append(opp)
-                        if verbose:
-                            print(f"    Value: {vegas_event.get('home_team')} YES @ {home_price:.0%} "
-                                  f"(Vegas: {vegas_probs['home_prob']:.0%}) = {home_calc.net_edge:.1%} edge", flush=True)
-
-            # Check away team for value
-            if away_market:
-                away_price = away_market.get('yes_ask', 0) / 100
-                if 0 < away_price < 1:
-                    away_calc = EdgeCalculation.calculate(
-                        kalshi_price=away_price,
-                        vegas_true_prob=vegas_probs['away_prob'],
-                        num_contracts=100,
-                        position='yes'
-                    )
-                    if away_calc.net_edge >= self.min_edge:
-                        prob_std = max(vegas_probs.get('home_std', 0), vegas_probs.get('away_std', 0))
-                        opp = ValueOpportunity(
-                            sport=vegas_event.get('sport_key', 'unknown'),
-                            vegas_event_id=vegas_event.get('id', ''),
-                            kalshi_ticker=away_market.get('ticker', ''),
-                            home_team=vegas_event.get('home_team', ''),
-                            away_team=vegas_event.get('away_team', ''),
-                            vegas_home_prob=vegas_probs['home_prob'],
-                            vegas_away_prob=vegas_probs['away_prob'],
-                            kalshi_home_price=home_market.get('yes_ask', 0) / 100 if home_market else 0,
-                            kalshi_away_price=away_price,
-                            recommended_position='yes',
-                            recommended_team='away',
-                            gross_edge=away_calc.gross_edge,
-                            net_edge=away_calc.net_edge,
-                            fee_impact=away_calc.fee_per_contract,
-                            expected_value_per_contract=away_calc.expected_value_per_contract,
-                            expected_value_100_contracts=away_calc.total_expected_value,
-                            num_bookmakers=vegas_probs['num_bookmakers'],
-                            confidence=self._determine_confidence(vegas_probs['num_bookmakers'], prob_std)
-                        )
-                        opportunities.append(opp)
-                        if verbose:
-                            print(f"    Value: {vegas_event.get('away_team')} YES @ {away_price:.0%} "
-                                  f"(Vegas: {vegas_probs['away_prob']:.0%}) = {away_calc.net_edge:.1%} edge", flush=True)
+        if self.change_detector:
+            # Only events whose odds or Kalshi asks moved since last scan are recomputed
+            opportunities = self.change_detector.evaluate(
+                matches, self._consensus,
+                lambda m, probs: self._find_match_value(m, probs, verbose))
+        else:
+            consensus = self._consensus([match['vegas_event'] for match in matches])
+            opportunities = self._find_value(matches, consensus, verbose)
+
+        if self.change_detector:
+            self.change_detector.prune()
+            if verbose:
+                print(f"  Reused {self.change_detector.reused}, recomputed {self.change_detector.recomputed} "
+                      f"events so far", flush=True)
 
         # Best opportunities first
         return sorted(opportunities, key=lambda x: x.net_edge, reverse=True)
+
+    def _find_match_value(self, match: Dict, vegas_probs: Dict,
+                          verbose: bool = False) -> List[ValueOpportunity]:
+        """Check both sides of one matched game against the Vegas consensus."""
+        return self._find_value([match], [vegas_probs], verbose)
+
+    def _find_value(self, matches: List[Dict], consensus: List[Optional[Dict]],
+                    verbose: bool = False) -> List[ValueOpportunity]:
+        """
+        Check both sides of every matched game against its Vegas consensus.
+
+        Edges for all sides are computed in one batch; opportunity objects are
+        only built for the few that clear min_edge.
+        """
+        sides = []  # (match, vegas_probs, team, kalshi price)
+        for match, vegas_probs in zip(matches, consensus):
+            if not vegas_probs:
+                continue
+            for team in ('home', 'away'):
+                market = match.get(f'kalshi_{team}_market')
+                if market:
+                    price = market.get('yes_ask', 0) / 100
+                    if 0 < price < 1:
+                        sides.append((match, vegas_probs, team, price))
+        if not sides:
+            return []
+
+        edges = EdgeCalculation.calculate_batch(
+            kalshi_prices=[price for _, _, _, price in sides],
+            vegas_true_probs=[probs[f'{team}_prob'] for _, probs, team, _ in sides],
+            num_contracts=100,
+            positions='yes'
+        )
+        return [self._make_opportunity(*sides[i], edges.row(i), verbose)
+                for i in edges.passing(self.min_edge)]
+
+    def _make_opportunity(self, match: Dict, vegas_probs: Dict, team: str, price: float,
+                          calc: EdgeCalculation, verbose: bool = False) -> ValueOpportunity:
+        """Package one side of a matched game that has value."""
+        vegas_event = match['vegas_event']
+        home_market = match.get('kalshi_home_market')
+        away_market = match.get('kalshi_away_market')
+        prob_std = max(vegas_probs.get('home_std', 0), vegas_probs.get('away_std', 0))
+        market = home_market if team == 'home' else away_market
+        opp = ValueOpportunity(
+            sport=vegas_event.get('sport_key', 'unknown'),
+            vegas_event_id=vegas_event.get('id', ''),
+            kalshi_ticker=market.get('ticker', ''),
+            home_team=vegas_event.get('home_team', ''),
+            away_team=vegas_event.get('away_team', ''),
+            vegas_home_prob=vegas_probs['home_prob'],
+            vegas_away_prob=vegas_probs['away_prob'],
+            kalshi_home_price=home_market.get('yes_ask', 0) / 100 if home_market else 0,
+            kalshi_away_price=away_market.get('yes_ask', 0) / 100 if away_market else 0,
+            recommended_position='yes',
+            recommended_team=team,
+            gross_edge=calc.gross_edge,
+            net_edge=calc.net_edge,
+            fee_impact=calc.fee_per_contract,
+            expected_value_per_contract=calc.expected_value_per_contract,
+            expected_value_100_contracts=calc.total_expected_value,
+            num_bookmakers=vegas_probs['num_bookmakers'],
+            confidence=self._determine_confidence(vegas_probs['num_bookmakers'], prob_std)
+        )
+        if verbose:
+            print(f"    Value: {vegas_event.get(f'{team}_team')} YES @ {price:.0%} "
+                  f"(Vegas: {vegas_probs[f'{team}_prob']:.0%}) = {calc.net_edge:.1%} edge", flush=True)
+        return opp
@@ -4,14 +4,28 @@
 import argparse
 import logging
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 from api.kalshi_api import KalshiClient
-from api.odds_api import OddsAPIClient
+from api.odds_api import OddsAPIClient, request_cost
+from api.fetcher import fetch_all, stream_sports
+from api.response_cache import ResponseCache
+from api.quota_scheduler import QuotaScheduler, parse_commence_time
 from core.value_finder import ValueFinder
-from output.console import print_opportunities, print_summary, print_compact_table
+from core.match_cache import MatchCache
+from core.change_detector import ChangeDetector
+from output.console import (
+    print_header, print_opportunity, print_summary, print_compact_table, print_poll_plan,
+    get_sport_display_name
+)
 from output.csv_export import export_to_csv, export_detailed_csv, append_to_history
-from config.settings import TARGET_SPORTS, MIN_NET_EDGE, ODDS_API_KEY, KALSHI_API_KEY
+from config.settings import (
+    TARGET_SPORTS, MIN_NET_EDGE, ODDS_API_KEY, KALSHI_API_KEY, MATCH_ASSIGNMENT, FETCH_DEADLINE,
+    ODDS_POLL_INTERVAL, ODDS_HOURS_AHEAD, ODDS_BOOKMAKERS, KALSHI_SPORT_MAP, WATCH_INTERVAL,
+    WATCH_HOURS_AHEAD, KALSHI_MAX_CONCURRENCY, SIZING_BUDGET
+)
 
 
 def setup_logging(verbose: bool = False):
@@ -33,6 +47,31 @@ def parse_args():
     parser.add_argument('--compact', action='store_true', help='Use compact table output')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--dry-run', action='store_true', help='Only fetch Kalshi markets (no Vegas API calls)')
+    parser.add_argument('--no-match-cache', action='store_true', help='Re-match every game instead of using the match cache')
+    parser.add_argument('--match-assignment', choices=['greedy', 'optimal'], default=MATCH_ASSIGNMENT,
+                        help='greedy: each Vegas event takes its best game; optimal: one-to-one max-score pairing')
+    parser.add_argument('--response-cache', action='store_true',
+                        help='Serve Kalshi listings from a short-lived cache (asks may be up to 2.5 minutes old)')
+    parser.add_argument('--hours-ahead', type=float, default=ODDS_HOURS_AHEAD,
+                        help='Only fetch Vegas odds for games starting within this many hours')
+    parser.add_argument('--skip-live', action='store_true', help='Skip games that have already started')
+    parser.add_argument('--bookmakers', nargs='+', default=ODDS_BOOKMAKERS,
+                        help='Odds API bookmaker keys to use instead of every US book (e.g. draftkings fanduel)')
+    parser.add_argument('--poll', action='store_true',
+                        help='Keep scanning, polling each sport as often as the Odds API quota allows')
+    parser.add_argument('--poll-interval', type=float, default=ODDS_POLL_INTERVAL,
+                        help='Target refresh interval in seconds for sports with games coming up')
+    parser.add_argument('--watch', action='store_true',
+                        help='After the scan, keep re-polling just the games near kickoff that show an edge')
+    parser.add_argument('--watch-hours', type=float, default=WATCH_HOURS_AHEAD,
+                        help='Watch games starting within this many hours')
+    parser.add_argument('--watch-interval', type=float, default=WATCH_INTERVAL,
+                        help='Seconds between refreshes of watched games')
+    parser.add_argument('--watch-events', nargs='+', help='Only watch these Vegas event ids')
+    parser.add_argument('--fetch-deadline', type=float, default=FETCH_DEADLINE,
+                        help='Seconds to wait for all Kalshi and Vegas fetches')
+    parser.add_argument('--budget', type=float, default=SIZING_BUDGET,
+                        help='Dollars per opportunity for the position sizing suggestions')
     return parser.parse_args()
 
 
@@ -55,27 +94,19 @@ def main():
     print(f"Minimum edge threshold: {args.min_edge * 100:.1f}%\n")
 
     try:
-        kalshi_client = KalshiClient(args.kalshi_api_key)
+        response_cache = ResponseCache() if args.response_cache else None
+        kalshi_client = KalshiClient(args.kalshi_api_key, response_cache=response_cache)
         odds_client = OddsAPIClient(args.odds_api_key) if not args.dry_run else None
     except Exception as e:
         logger.error(f"Failed to initialize API clients: {e}")
         sys.exit(1)
 
-    sport_key_map = {
-        'americanfootball_nfl': 'nfl', 'basketball_nba': 'nba', 'icehockey_nhl': 'nhl',
-        'baseball_mlb': 'mlb', 'basketball_ncaab': 'ncaab', 'basketball_wncaab': 'ncaaw',
-    }
-    kalshi_sports = [sport_key_map.get(s, s) for s in sports if s in sport_key_map]
-
-    print("Fetching Kalshi game winner markets...", flush=True)
-    try:
-        kalshi_markets = kalshi_client.get_game_winner_markets(sports=kalshi_sports, verbose=True)
+    if args.dry_run:
+        print("Fetching Kalshi game winner markets...", flush=True)
+        kalshi_data, _ = fetch_all(kalshi_client, None, sports, deadline=args.fetch_deadline)
+        kalshi_markets = [market for markets in kalshi_data.values() for market in markets]
         print(f"  Total: {len(kalshi_markets)} game winner markets", flush=True)
-    except Exception as e:
-        logger.error(f"Failed to fetch Kalshi markets: {e}")
-        sys.exit(1)
 
-    if args.dry_run:
         print("\n--- Dry Run: Kalshi Game Winner Markets ---")
         for market in kalshi_markets[:20]:
             team = market.get('_team_code', '?')
@@ -85,44 +116,185 @@ def main():
             print(f"  ... and {len(kalshi_markets) - 20} more")
         return
 
-    print("\nFetching Vegas odds...", flush=True)
-    vegas_data = {}
-    total_events = 0
-    for sport in sports:
-        try:
-            print(f"  - {sport}...", end=" ", flush=True)
-            events = odds_client.get_h2h_odds(sport)
-            vegas_data[sport] = events
-            total_events += len(events)
-            print(f"{len(events)} events", flush=True)
-        except Exception as e:
-            logger.warning(f"Failed to fetch {sport}: {e}")
-            vegas_data[sport] = []
+    match_cache = None if args.no_match_cache else MatchCache()
+    finder = ValueFinder(min_edge=args.min_edge, min_bookmakers=args.min_bookmakers,
+                         match_cache=match_cache, match_assignment=args.match_assignment,
+                         bookmakers=args.bookmakers,
+                         change_detector=ChangeDetector() if args.poll else None)
+
+    if args.poll:
+        return poll(args, sports, kalshi_client, odds_client, finder)
+
+    all_opportunities, vegas_data, total_markets = run_scan(args, sports, kalshi_client, odds_client, finder)
+    total_events = sum(len(events) for events in vegas_data.values())
 
     quota = odds_client.get_quota_info()
     if quota['remaining']:
         print(f"\nAPI quota remaining: {quota['remaining']}")
 
-    print("\nAnalyzing for value opportunities...", flush=True)
-    finder = ValueFinder(min_edge=args.min_edge, min_bookmakers=args.min_bookmakers)
-    all_vegas_events = [e for events in vegas_data.values() for e in events]
-    all_opportunities = finder.find_game_winner_value(all_vegas_events, kalshi_markets, verbose=args.verbose)
+    print_summary(total_events, total_markets, all_opportunities)
+    export_results(args, all_opportunities)
 
-    if args.compact:
-        print_compact_table(all_opportunities)
-    else:
-        print_opportunities(all_opportunities)
+    if args.watch:
+        watch(args, kalshi_client, odds_client, finder, all_opportunities, vegas_data)
 
-    print_summary(total_events, len(kalshi_markets), all_opportunities)
+    return 0 if all_opportunities else 1
 
-    if args.export_csv and all_opportunities:
-        export_to_csv(all_opportunities)
-    if args.detailed_export and all_opportunities:
-        export_detailed_csv(all_opportunities)
-    if args.track_history and all_opportunities:
-        append_to_history(all_opportunities)
 
-    return 0 if all_opportunities else 1
+def odds_filters(args):
+    """Odds API filters for this scan; the commence-time window is relative to now."""
+    now = datetime.now(timezone.utc)
+    filters = {}
+    if args.skip_live:
+        filters['commence_time_from'] = now
+    if args.hours_ahead is not None:
+        filters['commence_time_to'] = now + timedelta(hours=args.hours_ahead)
+    if args.bookmakers:
+        filters['bookmakers'] = args.bookmakers
+    return filters
+
+
+def run_scan(args, sports, kalshi_client, odds_client, finder):
+    """
+    Fetch and analyze `sports`, printing each sport's opportunities as soon as it's done.
+
+    Returns (opportunities sorted by net edge, Vegas events per sport, Kalshi market count).
+    """
+    # Each sport is analyzed as soon as both its Kalshi markets and Vegas odds are in
+    print("Fetching and analyzing each sport as it arrives...", flush=True)
+    if not args.compact:
+        print_header()
+    all_opportunities = []
+    vegas_data = {}
+    total_markets = 0
+    if odds_client:
+        # Quota is read afresh each scan, so a monthly reset is picked up
+        odds_client.start_quota_window()
+    for sport, kalshi_markets, vegas_events in stream_sports(kalshi_client, odds_client, sports,
+                                                              deadline=args.fetch_deadline,
+                                                              odds_filters=odds_filters(args)):
+        vegas_data[sport] = vegas_events
+        total_markets += len(kalshi_markets)
+        if not vegas_events or not kalshi_markets:
+            continue
+
+        opportunities = finder.find_game_winner_value(vegas_events, kalshi_markets, verbose=args.verbose)
+        print(f"\n{get_sport_display_name(sport)}: {len(opportunities)} opportunities "
+              f"({len(vegas_events)} Vegas events, {len(kalshi_markets)} Kalshi markets)\n", flush=True)
+        if args.compact:
+            if opportunities:
+                print_compact_table(opportunities, args.budget)
+        else:
+            for i, opp in enumerate(opportunities, len(all_opportunities) + 1):
+                print_opportunity(opp, i, args.budget)
+                print()
+        all_opportunities.extend(opportunities)
+
+    if not all_opportunities:
+        print("No value opportunities found meeting criteria.\n")
+    all_opportunities.sort(key=lambda x: x.net_edge, reverse=True)
+    return all_opportunities, vegas_data, total_markets
+
+
+def export_results(args, opportunities):
+    if args.export_csv and opportunities:
+        export_to_csv(opportunities)
+    if args.detailed_export and opportunities:
+        export_detailed_csv(opportunities)
+    if args.track_history and opportunities:
+        append_to_history(opportunities)
+
+
+def poll(args, sports, kalshi_client, odds_client, finder):
+    """
+    Keep scanning, polling each sport as often as the remaining Odds API quota allows.
+
+    After every pass the QuotaScheduler re-plans from the latest quota reading
+    and the kickoff times just seen, and the plan is printed for auditing.
+    """
+    scheduler = QuotaScheduler(sports, target_interval=args.poll_interval,
+                               credits_per_poll=request_cost(bookmakers=args.bookmakers))
+    try:
+        while True:
+            due = scheduler.due()
+            if due:
+                print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Polling: {', '.join(due)}", flush=True)
+                opportunities, vegas_data, _ = run_scan(args, due, kalshi_client, odds_client, finder)
+                for sport in due:
+                    scheduler.observe(sport, vegas_data.get(sport, []))
+                export_results(args, opportunities)
+
+                remaining = odds_client.get_quota_info()['remaining']
+                print_poll_plan(scheduler.make_plan(float(remaining) if remaining is not None else None))
+            time.sleep(max(1.0, scheduler.seconds_until_next()))
+    except KeyboardInterrupt:
+        print("\nStopped polling.")
+    return 0
+
+
+def watch(args, kalshi_client, odds_client, finder, opportunities, vegas_data):
+    """
+    Re-poll only the games close to kickoff that are showing an edge.
+
+    Each refresh costs one Odds API request per sport (the watched events are
+    fetched together) plus one Kalshi request per game, instead of
+    re-downloading whole leagues. A game drops off the watch list once it
+    starts or disappears from the API.
+    """
+    commence_times = {e.get('id'): parse_commence_time(e.get('commence_time', ''))
+                      for events in vegas_data.values() for e in events}
+    now = datetime.now(timezone.utc)
+    hot = {}  # Vegas event id -> (sport, Kalshi event ticker, kickoff)
+    for opp in opportunities:
+        kickoff = commence_times.get(opp.vegas_event_id)
+        if args.watch_events and opp.vegas_event_id not in args.watch_events:
+            continue
+        if kickoff and now < kickoff <= now + timedelta(hours=args.watch_hours):
+            hot[opp.vegas_event_id] = (opp.sport, opp.kalshi_ticker.rsplit('-', 1)[0], kickoff)
+
+    if not hot:
+        print("No games near kickoff showing an edge to watch.")
+        return
+
+    sports = {sport for sport, _, _ in hot.values()}
+    credits = len(sports) * request_cost(bookmakers=args.bookmakers) * 3600 / args.watch_interval
+    print(f"\nWatching {len(hot)} games every {args.watch_interval:g}s "
+          f"(up to {credits:.0f} Odds API credits/hour). Ctrl-C to stop.", flush=True)
+    kalshi_pool = ThreadPoolExecutor(max_workers=KALSHI_MAX_CONCURRENCY)
+    try:
+        while hot:
+            time.sleep(args.watch_interval)
+            now = datetime.now(timezone.utc)
+            odds_client.start_quota_window()
+            for event_id in [eid for eid, (_, _, kickoff) in hot.items() if kickoff <= now]:
+                print(f"  {event_id} has started, no longer watching")
+                del hot[event_id]
+
+            for sport in sorted({sport for sport, _, _ in hot.values()}):
+                event_ids = [eid for eid, (s, _, _) in hot.items() if s == sport]
+                try:
+                    events = odds_client.refresh_events(sport, event_ids, bookmakers=args.bookmakers)
+                    tickers = sorted({hot[eid][1] for eid in event_ids})
+                    markets = [market for game in kalshi_pool.map(
+                                   lambda ticker: kalshi_client.get_game_markets(KALSHI_SPORT_MAP[sport], ticker),
+                                   tickers)
+                               for market in game]
+                except Exception as e:
+                    logging.getLogger(__name__).warning(f"Failed to refresh {sport}: {e}")
+                    continue
+                for event_id in set(event_ids) - {e.get('id') for e in events}:
+                    print(f"  {event_id} is no longer listed, no longer watching")
+                    del hot[event_id]
+
+                found = finder.find_game_winner_value(events, markets, verbose=args.verbose)
+                print(f"\n[{now.astimezone().strftime('%H:%M:%S')}] {get_sport_display_name(sport)}: "
+                      f"{len(found)} opportunities across {len(event_ids)} watched games", flush=True)
+                if found:
+                    print_compact_table(found, args.budget)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        kalshi_pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == '__main__':
@@ -2,6 +2,10 @@
 
 from dataclasses import dataclass
 
+import numpy as np
+
+from core.fee_calculator import calculate_kalshi_fee, calculate_kalshi_fees
+
 
 @dataclass
 class ValueOpportunity:
@@ -55,8 +59,6 @@ class EdgeCalculation:
                   num_contracts: int = 100, position: str = 'yes',
                   is_maker: bool = False) -> 'EdgeCalculation':
         """Calculate edge for a position."""
-        from core.fee_calculator import calculate_kalshi_fee
-
         fee = calculate_kalshi_fee(kalshi_price, num_contracts, is_maker)
         fee_per_contract = fee / num_contracts
 
@@ -90,3 +92,77 @@ class EdgeCalculation:
             total_expected_value=expected_value * num_contracts,
             is_value_bet=net_edge > 0
         )
+
+    @classmethod
+    def calculate_batch(cls, kalshi_prices, vegas_true_probs, num_contracts=100,
+                        positions='yes', is_maker: bool = False) -> 'EdgeBatch':
+        """
+        calculate() over arrays, returning columns instead of objects.
+
+        Arguments broadcast against each other (a scalar num_contracts or
+        position applies to every row). Build EdgeCalculation objects with
+        EdgeBatch.row() only for the rows worth keeping.
+        """
+        prices, probs, contracts, positions = np.broadcast_arrays(
+            np.asarray(kalshi_prices, dtype=float), np.asarray(vegas_true_probs, dtype=float),
+            np.asarray(num_contracts), np.asarray(positions))
+        fee_per_contract = calculate_kalshi_fees(prices, contracts, is_maker) / contracts
+
+        is_yes = positions == 'yes'
+        bet_price = np.where(is_yes, prices, 1 - prices)
+        relevant_prob = np.where(is_yes, probs, 1 - probs)
+        effective_cost = bet_price + fee_per_contract
+        potential_profit = 1.00 - effective_cost
+        expected_value = (relevant_prob * potential_profit) - ((1 - relevant_prob) * effective_cost)
+        net_edge = relevant_prob - effective_cost
+
+        return EdgeBatch(
+            position=positions,
+            kalshi_price=bet_price,
+            vegas_prob=relevant_prob,
+            num_contracts=contracts,
+            fee_per_contract=fee_per_contract,
+            effective_cost=effective_cost,
+            gross_edge=relevant_prob - bet_price,
+            net_edge=net_edge,
+            expected_value_per_contract=expected_value,
+            total_expected_value=expected_value * contracts
+        )
+
+
+@dataclass
+class EdgeBatch:
+    """Columnar edge calculations, one entry per row (see EdgeCalculation.calculate_batch)."""
+    position: np.ndarray
+    kalshi_price: np.ndarray
+    vegas_prob: np.ndarray
+    num_contracts: np.ndarray
+    fee_per_contract: np.ndarray
+    effective_cost: np.ndarray
+    gross_edge: np.ndarray
+    net_edge: np.ndarray
+    expected_value_per_contract: np.ndarray
+    total_expected_value: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.net_edge)
+
+    def passing(self, min_edge: float) -> np.ndarray:
+        """Indices of rows with net edge of at least min_edge."""
+        return np.flatnonzero(self.net_edge >= min_edge)
+
+    def row(self, i: int) -> EdgeCalculation:
+        """Row i as an EdgeCalculation."""
+        net_edge = float(self.net_edge[i])
+        return EdgeCalculation(
+            position=str(self.position[i]),
+            kalshi_price=float(self.kalshi_price[i]),
+            vegas_prob=float(self.vegas_prob[i]),
+            fee_per_contract=float(self.fee_per_contract[i]),
+            effective_cost=float(self.effective_cost[i]),
+            gross_edge=float(self.gross_edge[i]),
+            net_edge=net_edge,
+            expected_value_per_contract=float(self.expected_value_per_contract[i]),
+            total_expected_value=float(self.total_expected_value[i]),
+            is_value_bet=net_edge > 0
+        )
@@ -0,0 +1,47 @@
+"""Data models for Odds API polling decisions."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class PollDecision:
+    """How often one sport will be polled, and why."""
+    sport: str
+    weight: float
+    games_in_horizon: int
+    in_play: int
+    hours_to_next_game: Optional[float]
+    polls_per_hour: float
+    credits_per_poll: float
+    interval_seconds: float
+    next_poll_at: datetime
+    reason: str
+
+    @property
+    def credits_per_hour(self) -> float:
+        return self.polls_per_hour * self.credits_per_poll
+
+
+@dataclass
+class PollPlan:
+    """One scheduling pass: the credit budget and every sport's decision."""
+    created_at: datetime
+    remaining_credits: Optional[float]
+    period_end: datetime
+    budget_per_hour: Optional[float]
+    decisions: List[PollDecision] = field(default_factory=list)
+
+    @property
+    def projected_per_hour(self) -> float:
+        """Credits per hour this plan will burn."""
+        return sum(d.credits_per_hour for d in self.decisions)
+
+    @property
+    def projected_credits_left(self) -> Optional[float]:
+        """Credits left at the end of the quota period if this plan held throughout."""
+        if self.remaining_credits is None:
+            return None
+        hours = (self.period_end - self.created_at).total_seconds() / 3600
+        return self.remaining_credits - self.projected_per_hour * hours
@@ -0,0 +1,41 @@
+"""Data models for position sizing."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class PositionSize:
+    """One order size: what it costs and what it's expected to return."""
+    contracts: int
+    cost: float
+    fee: float
+    expected_value: float
+
+    @property
+    def fee_per_contract(self) -> float:
+        return self.fee / self.contracts
+
+    @property
+    def profit_if_win(self) -> float:
+        return self.contracts - self.cost
+
+    @property
+    def ev_per_dollar(self) -> float:
+        return self.expected_value / self.cost
+
+
+@dataclass
+class SizingPlan:
+    """Suggested order sizes for one opportunity within a budget."""
+    price_cents: int
+    vegas_prob: float
+    budget: float
+    best: List[PositionSize] = field(default_factory=list)
+    smallest: Optional[PositionSize] = None
+    largest: Optional[PositionSize] = None
+
+    def rows(self) -> List[PositionSize]:
+        """Minimum, lowest-fee-drag and largest affordable sizes, by contract count."""
+        sizes = {size.contracts: size for size in [self.smallest, self.largest, *self.best] if size}
+        return [sizes[n] for n in sorted(sizes)]
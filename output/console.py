@@ -2,7 +2,8 @@
 
 from typing import List
 from models.opportunity import ValueOpportunity
-from config.settings import SPORT_DISPLAY_NAMES
+from models.poll_plan import PollPlan
+from config.settings import SPORT_DISPLAY_NAMES, SIZING_BUDGET
 
 
 def get_sport_display_name(sport_key: str) -> str:
@@ -23,8 +24,8 @@ def print_header():
     print("=" * 80 + "\n")
 
 
-def print_opportunity(opp: ValueOpportunity, index: int):
-    from core.fee_calculator import calculate_kalshi_fee, calculate_effective_cost
+def print_opportunity(opp: ValueOpportunity, index: int, budget: float = SIZING_BUDGET):
+    from core.position_sizer import size_position
 
     sport_name = get_sport_display_name(opp.sport)
 
@@ -37,11 +38,10 @@ def print_opportunity(opp: ValueOpportunity, index: int):
         bet_price = opp.kalshi_away_price
         vegas_prob = opp.vegas_away_prob
 
-    price_cents = int(bet_price * 100)
-    min_cost = calculate_effective_cost(bet_price, 1) if 0 < bet_price < 1 else bet_price
-    cost_10 = calculate_effective_cost(bet_price, 10) if 0 < bet_price < 1 else bet_price * 10
-    cost_50 = calculate_effective_cost(bet_price, 50) if 0 < bet_price < 1 else bet_price * 50
-    cost_100 = calculate_effective_cost(bet_price, 100) if 0 < bet_price < 1 else bet_price * 100
+    price_cents = round(bet_price * 100)
+    # Fees round up per order, so some sizes pay noticeably less fee per contract
+    sizing = size_position(bet_price, vegas_prob, budget)
+    best = {size.contracts for size in sizing.best}
 
     print(f"#{index} | {sport_name}")
     print(f"   Matchup: {opp.away_team} @ {opp.home_team}")
@@ -64,13 +64,16 @@ def print_opportunity(opp: ValueOpportunity, index: int):
     print(f"     NET EDGE:         {format_percentage(opp.net_edge, 2)}")
     print()
 
-    print(f"   Position Sizing (Kalshi min = 1 contract):")
-    print(f"     Contracts    Cost         Profit if Win    EV")
-    print(f"     ----------   ----------   --------------   --------")
-    print(f"     1 (min)      {format_dollars(min_cost):<10}   {format_dollars(1 - min_cost):<14}   {format_dollars(opp.expected_value_per_contract)}")
-    print(f"     10           {format_dollars(cost_10):<10}   {format_dollars(10 - cost_10):<14}   {format_dollars(opp.expected_value_per_contract * 10)}")
-    print(f"     50           {format_dollars(cost_50):<10}   {format_dollars(50 - cost_50):<14}   {format_dollars(opp.expected_value_per_contract * 50)}")
-    print(f"     100          {format_dollars(cost_100):<10}   {format_dollars(100 - cost_100):<14}   {format_dollars(opp.expected_value_100_contracts)}")
+    print(f"   Position Sizing (budget {format_dollars(budget)}, Kalshi min = 1 contract):")
+    print(f"     Contracts               Cost         Profit if Win    EV         Fee/Contract")
+    print(f"     ---------------------   ----------   --------------   --------   ------------")
+    for size in sizing.rows():
+        tags = [tag for tag, contracts in (('min', {sizing.smallest.contracts}), ('low fee', best),
+                                           ('max', {sizing.largest.contracts}))
+                if size.contracts in contracts]
+        label = f"{size.contracts} ({', '.join(tags)})" if tags else str(size.contracts)
+        print(f"     {label:<21}   {format_dollars(size.cost):<10}   {format_dollars(size.profit_if_win):<14}   "
+              f"{format_dollars(size.expected_value):<8}   {format_dollars(size.fee_per_contract, 4)}")
     print()
 
     print(f"   Confidence: {opp.confidence.upper()} ({opp.num_bookmakers} bookmakers)")
@@ -115,21 +118,40 @@ def print_summary(vegas_event_count: int, kalshi_market_count: int,
     print()
 
 
-def print_compact_table(opportunities: List[ValueOpportunity]):
+def print_compact_table(opportunities: List[ValueOpportunity], budget: float = SIZING_BUDGET):
+    from core.position_sizer import best_contracts
+
     if not opportunities:
         print("No opportunities found.")
         return
 
-    print(f"\n{'Sport':<7} {'BUY YES ON':<25} {'Ticker':<30} {'Price':<7} {'Edge':<8} {'EV':<8}")
-    print("-" * 95)
+    print(f"\n{'Sport':<7} {'BUY YES ON':<25} {'Ticker':<30} {'Price':<7} {'Edge':<8} {'EV':<8} {'Size':<6}")
+    print("-" * 102)
 
     for opp in opportunities:
         sport = get_sport_display_name(opp.sport)[:6]
         bet_team = opp.home_team[:24] if opp.recommended_team == 'home' else opp.away_team[:24]
         bet_price = opp.kalshi_home_price if opp.recommended_team == 'home' else opp.kalshi_away_price
-        price_cents = f"{int(bet_price * 100)}c"
+        price_cents = f"{round(bet_price * 100)}c"
         ticker = opp.kalshi_ticker[:29]
         edge = format_percentage(opp.net_edge, 1)
         ev = format_dollars(opp.expected_value_100_contracts)
-        print(f"{sport:<7} {bet_team:<25} {ticker:<30} {price_cents:<7} {edge:<8} {ev:<8}")
+        vegas_prob = opp.vegas_home_prob if opp.recommended_team == 'home' else opp.vegas_away_prob
+        size = best_contracts(bet_price, vegas_prob, budget)
+        print(f"{sport:<7} {bet_team:<25} {ticker:<30} {price_cents:<7} {edge:<8} {ev:<8} {size or '-':<6}")
+    print()
+
+
+def print_poll_plan(plan: PollPlan):
+    print(f"\nPoll plan ({plan.created_at.astimezone().strftime('%H:%M:%S')})")
+    if plan.budget_per_hour is not None:
+        print(f"  Credits remaining: {plan.remaining_credits:.0f} until {plan.period_end.strftime('%Y-%m-%d')} "
+              f"-> budget {plan.budget_per_hour:.2f}/hour, plan burns {plan.projected_per_hour:.2f}/hour "
+              f"({plan.projected_credits_left:.0f} left at reset)")
+    print(f"  {'Sport':<7} {'Weight':>6} {'Games':>5} {'Live':>4} {'Next':>7} {'Every':>8} {'Cr/hr':>6}  Reason")
+    for d in plan.decisions:
+        next_game = f"{d.hours_to_next_game:.1f}h" if d.hours_to_next_game is not None else '-'
+        every = f"{d.interval_seconds / 60:.0f}m" if d.interval_seconds != float('inf') else 'never'
+        print(f"  {get_sport_display_name(d.sport)[:6]:<7} {d.weight:>6.2f} {d.games_in_horizon:>5} "
+              f"{d.in_play:>4} {next_game:>7} {every:>8} {d.credits_per_hour:>6.2f}  {d.reason}")
     print()